@@ -2,13 +2,35 @@ from __future__ import annotations
 
 import argparse
 import csv
+import heapq
 import json
 import math
 import sys
+from array import array
+from collections import namedtuple
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from trafipipe import Pipeline, PipelineConfig
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional speedup
+    np = None
+
+_SUMMARY_FIELDS = ("elapsed_ms", "fetch_ms", "render_ms", "extract_ms", "image_ms")
+
+Record = namedtuple(
+    "Record",
+    "run url ok used_render elapsed_ms fetch_ms render_ms extract_ms image_ms "
+    "text_len images_count error",
+)
+
 
 def _load_urls(file_path: str | None, inline: list[str]) -> list[str]:
     urls: list[str] = []
@@ -22,108 +44,192 @@ def _load_urls(file_path: str | None, inline: list[str]) -> list[str]:
     return urls
 
 
+# json.dumps() builds a new encoder per call when given options; reuse one.
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _JSON_ENCODER.encode(obj).encode("utf-8")
+
+
+def _percentile_index(n: int, p: float) -> int:
+    k = int(math.ceil((p / 100.0) * n)) - 1
+    return max(0, min(k, n - 1))
+
+
 def _percentile(values: list[float], p: float) -> float | None:
     if not values:
         return None
-    values_sorted = sorted(values)
-    k = int(math.ceil((p / 100.0) * len(values_sorted))) - 1
-    k = max(0, min(k, len(values_sorted) - 1))
-    return values_sorted[k]
+    # Only the tail above the percentile matters, so select it instead of sorting.
+    return heapq.nlargest(len(values) - _percentile_index(len(values), p), values)[-1]
 
 
-def _avg(values: list[float]) -> float | None:
+def _avg(values) -> float | None:
     if not values:
         return None
     return sum(values) / len(values)
 
 
-def _summary(records: list[dict]) -> dict:
-    ok_count = sum(1 for r in records if not r.get("error"))
-    total = len(records)
-    used_render = sum(1 for r in records if r.get("used_render"))
+def _column_stats(values: array) -> dict:
+    n = len(values)
+    if not n:
+        return {"count": 0, "avg": None, "p95": None}
+    if np is not None:
+        arr = np.frombuffer(values, dtype=np.float64)
+        k = _percentile_index(n, 95.0)
+        return {
+            "count": n,
+            "avg": float(arr.sum() / n),
+            "p95": float(np.partition(arr, k)[k]),
+        }
+    return {"count": n, "avg": _avg(values), "p95": _percentile(values, 95.0)}
+
+
+class _SummaryAccumulator:
+    def __init__(self) -> None:
+        self.total = 0
+        self.ok = 0
+        self.used_render = 0
+        self.columns = {key: array("d") for key in _SUMMARY_FIELDS}
 
-    def _collect(key: str) -> list[float]:
-        return [v for r in records if (v := r.get(key)) is not None]
+    def add(self, r: Record) -> None:
+        self.total += 1
+        if not r.error:
+            self.ok += 1
+        if r.used_render:
+            self.used_render += 1
+        for key, column in self.columns.items():
+            v = getattr(r, key)
+            if v is not None:
+                column.append(v)
 
-    fields = ["elapsed_ms", "fetch_ms", "render_ms", "extract_ms", "image_ms"]
-    stats = {}
-    for key in fields:
-        values = _collect(key)
-        stats[key] = {
-            "count": len(values),
-            "avg": _avg(values),
-            "p95": _percentile(values, 95.0),
+    def summary(self) -> dict:
+        return {
+            "total": self.total,
+            "ok": self.ok,
+            "error": self.total - self.ok,
+            "used_render": self.used_render,
+            "stats": {key: _column_stats(col) for key, col in self.columns.items()},
         }
 
-    return {
-        "total": total,
-        "ok": ok_count,
-        "error": total - ok_count,
-        "used_render": used_render,
-        "stats": stats,
-    }
+
+def _summary(records: Iterable[Record]) -> dict:
+    acc = _SummaryAccumulator()
+    for r in records:
+        acc.add(r)
+    return acc.summary()
+
+
+_OUTPUT_BUFFER_SIZE = 1 << 20
+
+_CSV_HEADER = Record._fields
+
+# Match the separators _dumps produces so streamed JSON stays byte-identical.
+_JSON_ITEM_SEP = b"," if orjson is not None else b", "
+_JSON_KEY_SEP = b":" if orjson is not None else b": "
+
+
+def _row_iter(records: Iterable[Record]):
+    for r in records:
+        yield r._replace(
+            ok=int(bool(r.ok)),
+            used_render=int(bool(r.used_render)),
+            error=r.error or "",
+        )
+
+
+def _tap(records: Iterable[Record], acc: _SummaryAccumulator | None):
+    if acc is None:
+        yield from records
+        return
+    for r in records:
+        acc.add(r)
+        yield r
+
+
+def _write_json(
+    records: Iterable[Record], out, acc: _SummaryAccumulator | None
+) -> None:
+    write = out.write
+    write(b'{"results"' + _JSON_KEY_SEP + b"[")
+    sep = b""
+    for r in _tap(records, acc):
+        write(sep)
+        write(_dumps(r._asdict()))
+        sep = _JSON_ITEM_SEP
+    write(b"]")
+    if acc is not None:
+        write(_JSON_ITEM_SEP + b'"summary"' + _JSON_KEY_SEP + _dumps(acc.summary()))
+    write(b"}")
 
 
 def _write_records(
-    records: list[dict], fmt: str, output: str | None, summary: dict | None
+    records: Iterable[Record],
+    fmt: str,
+    output: str | None,
+    acc: _SummaryAccumulator | None = None,
 ) -> None:
     if fmt == "json":
-        payload = {"results": records}
-        if summary is not None:
-            payload["summary"] = summary
-        text = json.dumps(payload, ensure_ascii=False)
         if output:
-            Path(output).write_text(text, encoding="utf-8")
+            with open(output, "wb", buffering=_OUTPUT_BUFFER_SIZE) as out:
+                _write_json(records, out, acc)
         else:
-            print(text)
+            sys.stdout.flush()
+            out = sys.stdout.buffer
+            _write_json(records, out, acc)
+            out.write(b"\n")
+            out.flush()
         return
 
     if output:
-        out = open(output, "w", encoding="utf-8", newline="")
-        close_out = True
+        out = open(
+            output, "w", encoding="utf-8", newline="", buffering=_OUTPUT_BUFFER_SIZE
+        )
     else:
-        out = sys.stdout
-        close_out = False
+        sys.stdout.flush()
+        out = open(
+            sys.stdout.fileno(),
+            "w",
+            encoding="utf-8",
+            newline="",
+            buffering=_OUTPUT_BUFFER_SIZE,
+            closefd=False,
+        )
 
     try:
         delimiter = "\t" if fmt == "tsv" else ","
         writer = csv.writer(out, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL)
-        writer.writerow(
-            [
-                "run",
-                "url",
-                "ok",
-                "used_render",
-                "elapsed_ms",
-                "fetch_ms",
-                "render_ms",
-                "extract_ms",
-                "image_ms",
-                "text_len",
-                "images_count",
-                "error",
-            ]
-        )
-        for r in records:
-            writer.writerow(
-                [
-                    r.get("run"),
-                    r.get("url"),
-                    int(bool(r.get("ok"))),
-                    int(bool(r.get("used_render"))),
-                    r.get("elapsed_ms"),
-                    r.get("fetch_ms"),
-                    r.get("render_ms"),
-                    r.get("extract_ms"),
-                    r.get("image_ms"),
-                    r.get("text_len"),
-                    r.get("images_count"),
-                    r.get("error") or "",
-                ]
-            )
+        writer.writerow(_CSV_HEADER)
+        writer.writerows(_row_iter(_tap(records, acc)))
     finally:
-        if close_out:
-            out.close()
+        out.close()
+
+
+def _run_records(
+    pipeline: Pipeline, urls: list[str], repeat: int, workers: int = 1
+) -> Iterator[Record]:
+    for run in range(1, max(1, repeat) + 1):
+        if workers > 1:
+            results = pipeline.extract_batch(urls, max_workers=workers)
+        else:
+            results = (pipeline.extract_url(url) for url in urls)
+        for url, result in zip(urls, results):
+            yield Record(
+                run,
+                url,
+                not result.error,
+                result.used_render,
+                result.elapsed_ms,
+                result.fetch_ms,
+                result.render_ms,
+                result.extract_ms,
+                result.image_ms,
+                len(result.text or ""),
+                len(result.images or []),
+                result.error or "",
+            )
 
 
 def main() -> int:
@@ -137,6 +243,9 @@ def main() -> int:
     parser.add_argument("--max-bytes", type=int, default=200000)
     parser.add_argument("--keep-images", action="store_true")
     parser.add_argument("--reuse-context", action="store_true")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="extract URLs in N worker processes"
+    )
     parser.add_argument("--format", choices=["tsv", "csv", "json"], default="tsv")
     parser.add_argument("--output", help="write results to a file instead of stdout")
     parser.add_argument("--summary", action="store_true", help="print summary stats")
@@ -147,6 +256,7 @@ def main() -> int:
         parser.error("no urls provided")
 
     cfg = PipelineConfig()
+    cfg.debug_timings = True
     cfg.render.mode = args.render
     cfg.fetch.timeout = args.timeout
     cfg.render.timeout = args.render_timeout
@@ -156,38 +266,13 @@ def main() -> int:
 
     pipeline = Pipeline(cfg)
 
-    records: list[dict] = []
-    run = 0
-    for _ in range(max(1, args.repeat)):
-        run += 1
-        for url in urls:
-            result = pipeline.extract_url(url)
-            ok = "0" if result.error else "1"
-            text_len = len(result.text or "")
-            images_count = len(result.images or [])
-            error = result.error or ""
-            records.append(
-                {
-                    "run": run,
-                    "url": url,
-                    "ok": ok == "1",
-                    "used_render": result.used_render,
-                    "elapsed_ms": result.elapsed_ms,
-                    "fetch_ms": result.fetch_ms,
-                    "render_ms": result.render_ms,
-                    "extract_ms": result.extract_ms,
-                    "image_ms": result.image_ms,
-                    "text_len": text_len,
-                    "images_count": images_count,
-                    "error": error,
-                }
-            )
-
-    summary = _summary(records) if args.summary else None
-    _write_records(records, args.format, args.output, summary)
+    # Records are written as they are produced; only the summary columns are kept.
+    acc = _SummaryAccumulator() if args.summary else None
+    records = _run_records(pipeline, urls, args.repeat, args.workers)
+    _write_records(records, args.format, args.output, acc)
 
-    if args.summary and args.format != "json":
-        print(json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+    if acc is not None and args.format != "json":
+        print(_dumps(acc.summary()).decode("utf-8"), file=sys.stderr)
     return 0
 
 
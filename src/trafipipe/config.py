@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Sequence
 
+# dataclass(slots=...) needs Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class ProxyConfig:
     http: Optional[str] = None
     https: Optional[str] = None
@@ -50,7 +54,7 @@ class ProxyConfig:
         return proxy
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FetchConfig:
     timeout: float = 15.0
     user_agent: str = (
@@ -65,7 +69,7 @@ class FetchConfig:
     max_bytes: Optional[int] = 2_000_000
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class RenderConfig:
     mode: str = "auto"  # auto | always | never
     timeout: float = 20.0
@@ -80,7 +84,7 @@ class RenderConfig:
     reuse_context: bool = False
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ExtractConfig:
     with_metadata: bool = True
     favor_precision: bool = True
@@ -99,7 +103,7 @@ class ExtractConfig:
     min_text_len: int = 200
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class CrawlConfig:
     max_pages: int = 100
     max_depth: int = 2
@@ -111,9 +115,10 @@ class CrawlConfig:
     strip_query: bool = True
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PipelineConfig:
     fetch: FetchConfig = field(default_factory=FetchConfig)
     render: RenderConfig = field(default_factory=RenderConfig)
     extract: ExtractConfig = field(default_factory=ExtractConfig)
     crawl: CrawlConfig = field(default_factory=CrawlConfig)
+    debug_timings: bool = False  # fill fetch/render/extract/image/video _ms
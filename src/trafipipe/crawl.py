@@ -2,43 +2,84 @@ from __future__ import annotations
 
 import re
 from collections import deque
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from html.parser import HTMLParser
-from typing import Iterable, List, Optional, Sequence
-from urllib.parse import urljoin, urlparse, urldefrag
+from functools import lru_cache
+from hashlib import blake2b
+from html import unescape
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin, urlparse
 
 from .config import CrawlConfig, FetchConfig
 from .fetch import fetch_html
 
 
-class _LinkCollector(HTMLParser):
-    def __init__(self, base_url: str) -> None:
-        super().__init__()
-        self.base_url = base_url
-        self.links: List[str] = []
-
-    def handle_starttag(self, tag, attrs):
-        if tag != "a":
-            return
-        for key, value in attrs:
-            if key == "href" and value:
-                self.links.append(urljoin(self.base_url, value))
+_HREF_RE = re.compile(
+    r'<a\b[^>]*?\shref\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))',
+    re.IGNORECASE,
+)
+
+
+def _extract_links(html: str, base_url: str) -> List[str]:
+    links: List[str] = []
+    joined: Dict[str, str] = {}
+    for match in _HREF_RE.finditer(html):
+        href = match.group(1) or match.group(2) or match.group(3)
+        if not href:
+            continue
+        if "&" in href:
+            href = unescape(href)
+        if href.startswith(("http://", "https://")):
+            links.append(href)
+            continue
+        # Navigation-heavy pages repeat the same relative hrefs many times.
+        url = joined.get(href)
+        if url is None:
+            url = joined[href] = urljoin(base_url, href)
+        links.append(url)
+    return links
 
 
 def _normalize_url(url: str, strip_query: bool) -> str:
-    url, _ = urldefrag(url)
+    url = url.split("#", 1)[0]
     if strip_query:
-        parsed = urlparse(url)
-        url = parsed._replace(query="").geturl()
+        url = url.split("?", 1)[0]
     return url
 
 
-def _compile(patterns: Sequence[str]) -> List[re.Pattern]:
-    return [re.compile(p) for p in patterns]
+_QUEUED, _VISITED, _REJECTED = 0, 1, 2
+
+
+def _url_key(url: str) -> bytes:
+    return blake2b(url.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+@lru_cache(maxsize=64)
+def _compile_cached(patterns: Tuple[str, ...]) -> Tuple[re.Pattern, ...]:
+    if not patterns:
+        return ()
+    compiled = tuple(re.compile(p) for p in patterns)
+    # Patterns without groups can share one alternation, so a single regex call
+    # covers them; grouped ones stay separate since joining would renumber
+    # their backreferences.
+    plain = [c.pattern for c in compiled if not c.groups]
+    if len(plain) < 2:
+        return compiled
+    try:
+        merged = re.compile("|".join(f"(?:{p})" for p in plain))
+    except re.error:
+        # e.g. inline global flags that are only valid at the start
+        return compiled
+    return (merged,) + tuple(c for c in compiled if c.groups)
+
+
+def _compile(patterns: Sequence[str]) -> Tuple[re.Pattern, ...]:
+    return _compile_cached(tuple(patterns or ()))
 
 
-def _is_allowed(url: str, allow: List[re.Pattern], deny: List[re.Pattern]) -> bool:
+def _is_allowed(
+    url: str, allow: Sequence[re.Pattern], deny: Sequence[re.Pattern]
+) -> bool:
     if allow and not any(p.search(url) for p in allow):
         return False
     if deny and any(p.search(url) for p in deny):
@@ -46,6 +87,7 @@ def _is_allowed(url: str, allow: List[re.Pattern], deny: List[re.Pattern]) -> bo
     return True
 
 
+@lru_cache(maxsize=4096)
 def _host(url: str) -> str:
     return urlparse(url).netloc
 
@@ -76,8 +118,8 @@ def crawl_urls(
         return _host(u) in allowed_domains
 
     queue = deque()
-    queued = set()
-    visited = set()
+    # One state per URL digest; fixed-size keys keep the frontier small.
+    states: Dict[bytes, int] = {}
     results: List[str] = []
 
     def _enqueue(raw_url: str, depth: int) -> None:
@@ -86,86 +128,71 @@ def crawl_urls(
         url = _normalize_url(raw_url, crawl_config.strip_query)
         if not _is_http_url(url):
             return
-        if url in visited or url in queued:
-            return
-        if not domain_ok(url):
+        key = _url_key(url)
+        if key in states:
             return
-        if not _is_allowed(url, allow_patterns, deny_patterns):
+        if not domain_ok(url) or not _is_allowed(url, allow_patterns, deny_patterns):
+            states[key] = _REJECTED
             return
-        queued.add(url)
-        queue.append((url, depth))
+        states[key] = _QUEUED
+        queue.append((url, depth, key))
 
     for u in start_urls:
         _enqueue(u, 0)
 
-    max_workers = max(1, int(crawl_config.max_workers or 1))
-    executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
-
-    try:
-        while queue and len(visited) < crawl_config.max_pages:
-            if executor is None:
-                url, depth = queue.popleft()
-                queued.discard(url)
-
-                if url in visited:
-                    continue
+    def _take() -> Optional[Tuple[str, int]]:
+        url, depth, key = queue.popleft()
+        if states[key] != _QUEUED:
+            return None
 
-                visited.add(url)
-                results.append(url)
+        states[key] = _VISITED
+        results.append(url)
 
-                if depth >= crawl_config.max_depth:
-                    continue
+        if depth >= crawl_config.max_depth:
+            return None
+        return url, depth
 
-                try:
-                    fetched = fetch_html(url, fetch_config)
-                except Exception:
-                    continue
-                html = fetched.html
-
-                parser = _LinkCollector(url)
-                parser.feed(html)
-                for link in parser.links:
-                    _enqueue(link, depth + 1)
+    max_workers = max(1, int(crawl_config.max_workers or 1))
+    if max_workers <= 1:
+        while queue and len(results) < crawl_config.max_pages:
+            item = _take()
+            if item is None:
                 continue
-
-            batch = []
+            url, depth = item
+            try:
+                fetched = fetch_html(url, fetch_config)
+            except Exception:
+                continue
+            for link in _extract_links(fetched.html, url):
+                _enqueue(link, depth + 1)
+        return results
+
+    # Keep max_workers fetches in flight and refill as each one finishes,
+    # rather than waiting for a whole batch on its slowest response.
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        while True:
             while (
                 queue
-                and len(batch) < max_workers
-                and len(visited) < crawl_config.max_pages
+                and len(pending) < max_workers
+                and len(results) < crawl_config.max_pages
             ):
-                url, depth = queue.popleft()
-                queued.discard(url)
-
-                if url in visited:
-                    continue
-
-                visited.add(url)
-                results.append(url)
-
-                if depth >= crawl_config.max_depth:
+                item = _take()
+                if item is None:
                     continue
-
-                batch.append((url, depth))
-
-            futures = {
-                executor.submit(fetch_html, url, fetch_config): (url, depth)
-                for url, depth in batch
-            }
-            for future in as_completed(futures):
-                url, depth = futures[future]
+                future = executor.submit(fetch_html, item[0], fetch_config)
+                pending[future] = item
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                url, depth = pending.pop(future)
                 try:
                     fetched = future.result()
                 except Exception:
                     continue
-                html = fetched.html
-
-                parser = _LinkCollector(url)
-                parser.feed(html)
-                for link in parser.links:
+                for link in _extract_links(fetched.html, url):
                     _enqueue(link, depth + 1)
-    finally:
-        if executor is not None:
-            executor.shutdown(wait=True)
 
     return results
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 import atexit
-from dataclasses import dataclass
 import re
+import weakref
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Optional, Tuple
+from urllib.error import HTTPError, URLError
 from urllib.request import ProxyHandler, Request, build_opener
-from urllib.error import URLError, HTTPError
 
-from .config import FetchConfig
+from .config import _SLOTS, FetchConfig
 from .exceptions import FetchError
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FetchResult:
     html: str
     status_code: int
@@ -24,20 +27,43 @@ except Exception:
     httpx = None
     _HAS_HTTPX = False
 
+try:
+    import h2  # noqa: F401
+
+    _HAS_H2 = True
+except ImportError:  # pragma: no cover - optional speedup
+    _HAS_H2 = False
+
 
 _HTTPX_CLIENTS: Dict[Tuple[Tuple[Tuple[str, str], ...], Optional[str]], "httpx.Client"] = {}
+_ASYNC_HTTPX_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict]" = (
+    weakref.WeakKeyDictionary()
+)
 
+# Bounded repetition keeps the worst case linear in the scanned window.
 _META_CHARSET_RE = re.compile(
-    br'<meta[^>]+charset=["\']?\s*([A-Za-z0-9._-]+)',
-    re.IGNORECASE,
-)
-_META_HTTP_EQUIV_RE = re.compile(
-    br'<meta[^>]+http-equiv=["\']?content-type["\']?[^>]*content=["\'][^"\']*charset=([A-Za-z0-9._-]+)',
+    br'<meta[^>]{0,512}?charset\s*=\s*["\']?\s*([A-Za-z0-9._-]{1,32})',
     re.IGNORECASE,
 )
+_META_SCAN_BYTES = 4096
+# Hard ceiling for max_bytes=None so a hostile host cannot stream unbounded data.
+_MAX_BODY_BYTES = 64 * 1024 * 1024
 _CONTENT_TYPE_CHARSET_RE = re.compile(r"charset=([A-Za-z0-9._-]+)", re.IGNORECASE)
 
+# UTF-32 LE must be tested before UTF-16 LE: their BOMs share a prefix.
+_BOMS = (
+    (b"\xef\xbb\xbf", "utf-8-sig"),
+    (b"\x00\x00\xfe\xff", "utf-32"),
+    (b"\xff\xfe\x00\x00", "utf-32"),
+    (b"\xff\xfe", "utf-16"),
+    (b"\xfe\xff", "utf-16"),
+)
+# charset_normalizer probes every candidate code page over its input; a
+# bounded sample is enough to pick one.
+_DETECT_MAX_BYTES = 262144
+
 
+@lru_cache(maxsize=128)
 def _normalize_encoding(value: str) -> str:
     enc = (value or "").strip().strip('"').strip("'").lower()
     if not enc:
@@ -62,21 +88,22 @@ def _charset_from_content_type(value: Optional[str]) -> Optional[str]:
 def _detect_encoding(raw: bytes, header_encoding: Optional[str]) -> str:
     if header_encoding:
         return _normalize_encoding(header_encoding)
-    head = raw[:16384]
-    match = _META_CHARSET_RE.search(head)
+    # Also covers <meta http-equiv="Content-Type" content="...; charset=...">.
+    match = _META_CHARSET_RE.search(raw, 0, _META_SCAN_BYTES)
     if match:
         enc = _normalize_encoding(match.group(1).decode("ascii", errors="ignore"))
         if enc:
             return enc
-    match = _META_HTTP_EQUIV_RE.search(head)
-    if match:
-        enc = _normalize_encoding(match.group(1).decode("ascii", errors="ignore"))
-        if enc:
+    start = bytes(raw[:4])
+    for bom, enc in _BOMS:
+        if start.startswith(bom):
             return enc
+    if raw.isascii():
+        return "utf-8"
     try:
         from charset_normalizer import from_bytes  # type: ignore
 
-        best = from_bytes(raw).best()
+        best = from_bytes(raw[:_DETECT_MAX_BYTES], steps=4, chunk_size=4096).best()
         if best and best.encoding:
             return _normalize_encoding(best.encoding)
     except Exception:
@@ -90,26 +117,54 @@ def _proxy_key(proxies) -> Tuple[Tuple[str, str], ...]:
     return tuple()
 
 
+def _client_key(proxies) -> Tuple[Tuple[Tuple[str, str], ...], Optional[str]]:
+    return (_proxy_key(proxies), str(proxies) if not isinstance(proxies, dict) else None)
+
+
+def _new_client(factory, proxies):
+    kwargs = {"follow_redirects": True, "http2": _HAS_H2}
+    if httpx is not None:
+        kwargs["limits"] = httpx.Limits(
+            max_connections=100, max_keepalive_connections=32, keepalive_expiry=30.0
+        )
+    if proxies is None:
+        return factory(**kwargs)
+    try:
+        return factory(proxies=proxies, **kwargs)
+    except TypeError:
+        proxy_value = None
+        if isinstance(proxies, dict):
+            proxy_value = proxies.get("https://") or proxies.get("http://")
+        else:
+            proxy_value = proxies
+        return factory(proxy=proxy_value, **kwargs)
+
+
+@lru_cache(maxsize=16)
+def _httpx_timeout(timeout: Optional[float]):
+    # Fail fast on unreachable hosts while keeping the full budget for reads.
+    if timeout is None:
+        return None
+    return httpx.Timeout(timeout, connect=min(timeout, 5.0))
+
+
 def _httpx_client(proxies) -> "httpx.Client":
-    key = (_proxy_key(proxies), str(proxies) if not isinstance(proxies, dict) else None)
+    key = _client_key(proxies)
     client = _HTTPX_CLIENTS.get(key)
-    if client is not None:
-        return client
+    if client is None:
+        client = _new_client(httpx.Client, proxies)
+        _HTTPX_CLIENTS[key] = client
+    return client
 
-    if proxies is None:
-        client = httpx.Client(follow_redirects=True)
-    else:
-        try:
-            client = httpx.Client(follow_redirects=True, proxies=proxies)
-        except TypeError:
-            proxy_value = None
-            if isinstance(proxies, dict):
-                proxy_value = proxies.get("https://") or proxies.get("http://")
-            else:
-                proxy_value = proxies
-            client = httpx.Client(follow_redirects=True, proxy=proxy_value)
 
-    _HTTPX_CLIENTS[key] = client
+def _async_httpx_client(proxies) -> "httpx.AsyncClient":
+    # AsyncClient connections are bound to the loop that opened them.
+    clients = _ASYNC_HTTPX_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    key = _client_key(proxies)
+    client = clients.get(key)
+    if client is None:
+        client = _new_client(httpx.AsyncClient, proxies)
+        clients[key] = client
     return client
 
 
@@ -125,24 +180,70 @@ def _close_httpx_clients() -> None:
 atexit.register(_close_httpx_clients)
 
 
-def _read_limited(response, max_bytes: int) -> bytes:
+async def close_async_clients() -> None:
+    # AsyncClients can only be closed on their own loop, so the owner of the
+    # loop (Pipeline.aclose, or the caller before asyncio.run returns) does it.
+    clients = _ASYNC_HTTPX_CLIENTS.pop(asyncio.get_running_loop(), None)
+    for client in (clients or {}).values():
+        try:
+            await client.aclose()
+        except Exception:
+            pass
+
+
+def _body_limit(max_bytes: Optional[int]) -> int:
+    return _MAX_BODY_BYTES if max_bytes is None else max_bytes
+
+
+def _fits_limit(headers, limit: int) -> bool:
+    # Content-Length counts encoded bytes, so it only bounds the decoded body
+    # when there is no content-encoding.
+    length = headers.get("content-length")
+    if not length or headers.get("content-encoding", "identity") != "identity":
+        return False
+    try:
+        return 0 < int(length) <= limit
+    except ValueError:
+        return False
+
+
+def _read_limited(response, max_bytes: int) -> bytearray:
     if max_bytes <= 0:
-        return b""
+        return bytearray()
+    # Decoding accepts the buffer directly, so skip the bytes() copy.
     buf = bytearray()
+    remaining = max_bytes
     for chunk in response.iter_bytes():
-        if not chunk:
-            continue
-        remaining = max_bytes - len(buf)
-        if remaining <= 0:
+        if len(chunk) >= remaining:
+            buf += chunk[:remaining]
             break
-        if len(chunk) > remaining:
-            buf.extend(chunk[:remaining])
+        buf += chunk
+        remaining -= len(chunk)
+    return buf
+
+
+async def _aread_limited(response, max_bytes: int) -> bytearray:
+    if max_bytes <= 0:
+        return bytearray()
+    buf = bytearray()
+    remaining = max_bytes
+    async for chunk in response.aiter_bytes():
+        if len(chunk) >= remaining:
+            buf += chunk[:remaining]
             break
-        buf.extend(chunk)
-    return bytes(buf)
+        buf += chunk
+        remaining -= len(chunk)
+    return buf
 
 
-def _decode_response(raw: bytes, header_encoding: Optional[str]) -> str:
+def _decode_response(raw, header_encoding: Optional[str]) -> str:
+    if not header_encoding:
+        # Most undeclared bodies are UTF-8; a strict C decode is far cheaper
+        # than the meta/detector fallback. utf-8-sig also drops a BOM.
+        try:
+            return raw.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            pass
     encoding = _detect_encoding(raw, header_encoding)
     try:
         return raw.decode(encoding, errors="replace")
@@ -150,35 +251,34 @@ def _decode_response(raw: bytes, header_encoding: Optional[str]) -> str:
         return raw.decode("utf-8", errors="replace")
 
 
+def _request_headers(config: FetchConfig) -> Dict[str, str]:
+    # Built per call: FetchConfig is mutable (headers may be edited in place),
+    # so a cached merge could go stale. One dict display is cheap.
+    if not config.headers:
+        return {"User-Agent": config.user_agent}
+    return {"User-Agent": config.user_agent, **config.headers}
+
+
 def fetch_html(url: str, config: FetchConfig) -> FetchResult:
-    headers = {"User-Agent": config.user_agent}
-    headers.update(config.headers or {})
+    headers = _request_headers(config)
 
     if _HAS_HTTPX:
         proxies = config.proxy.to_httpx() if config.proxy else None
         try:
             client = _httpx_client(proxies)
-            if config.max_bytes is None:
-                resp = client.get(url, headers=headers, timeout=config.timeout)
-                if resp.status_code >= 400:
-                    raise FetchError(
-                        f"httpx status {resp.status_code} for {url}",
-                        status_code=resp.status_code,
-                    )
-                raw = resp.content
-                header_encoding = _charset_from_content_type(resp.headers.get("content-type"))
-                text = _decode_response(raw, header_encoding)
-                return FetchResult(text, resp.status_code)
-
             with client.stream(
-                "GET", url, headers=headers, timeout=config.timeout
+                "GET", url, headers=headers, timeout=_httpx_timeout(config.timeout)
             ) as resp:
                 if resp.status_code >= 400:
                     raise FetchError(
                         f"httpx status {resp.status_code} for {url}",
                         status_code=resp.status_code,
                     )
-                raw = _read_limited(resp, config.max_bytes)
+                limit = _body_limit(config.max_bytes)
+                if _fits_limit(resp.headers, limit):
+                    raw = resp.read()
+                else:
+                    raw = _read_limited(resp, limit)
                 header_encoding = _charset_from_content_type(resp.headers.get("content-type"))
                 text = _decode_response(raw, header_encoding)
                 return FetchResult(text, resp.status_code)
@@ -190,7 +290,7 @@ def fetch_html(url: str, config: FetchConfig) -> FetchResult:
     req = Request(url, headers=headers)
     try:
         with opener.open(req, timeout=config.timeout) as resp:
-            raw = resp.read(config.max_bytes or None)
+            raw = resp.read(config.max_bytes or _MAX_BODY_BYTES)
             charset = resp.headers.get_content_charset()
             status = resp.getcode() or 200
             text = _decode_response(raw, charset)
@@ -201,3 +301,31 @@ def fetch_html(url: str, config: FetchConfig) -> FetchResult:
             f"urllib fetch failed: {exc}",
             status_code=status_code if isinstance(status_code, int) else None,
         ) from exc
+
+
+async def fetch_html_async(url: str, config: FetchConfig) -> FetchResult:
+    if not _HAS_HTTPX:
+        return await asyncio.to_thread(fetch_html, url, config)
+
+    headers = _request_headers(config)
+    proxies = config.proxy.to_httpx() if config.proxy else None
+    try:
+        client = _async_httpx_client(proxies)
+        async with client.stream(
+            "GET", url, headers=headers, timeout=_httpx_timeout(config.timeout)
+        ) as resp:
+            if resp.status_code >= 400:
+                raise FetchError(
+                    f"httpx status {resp.status_code} for {url}",
+                    status_code=resp.status_code,
+                )
+            limit = _body_limit(config.max_bytes)
+            if _fits_limit(resp.headers, limit):
+                raw = await resp.aread()
+            else:
+                raw = await _aread_limited(resp, limit)
+            header_encoding = _charset_from_content_type(resp.headers.get("content-type"))
+            text = _decode_response(raw, header_encoding)
+            return FetchResult(text, resp.status_code)
+    except Exception as exc:
+        raise FetchError(f"httpx fetch failed: {exc}") from exc
@@ -1,30 +1,41 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field, replace
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from html import escape
+import asyncio
+import os
 import re
+import threading
 import time
-from typing import Iterable, List, Optional
-from urllib.parse import urlparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from html import escape
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence, TypeVar
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional speedup
+    ahocorasick = None
 
-from .config import PipelineConfig
+from .config import _SLOTS, PipelineConfig
 from .crawl import crawl_urls
 from .exceptions import FetchError, RenderError
 from .extract import (
+    _abs_urls_in,
+    _classify_site,
+    _collect_wechat_images,
+    _hostname,
     collect_huanqiu_images,
     collect_images,
     collect_videos,
-    filter_videos_for_url,
-    _collect_wechat_images,
     extract_text_and_metadata,
-    extract_metadata_from_html,
+    filter_videos_for_url,
 )
-from .fetch import fetch_html
-from .render import render_html_with_media
+from .fetch import FetchResult, close_async_clients, fetch_html, fetch_html_async
+from .render import prewarm_browser, render_html_with_media
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ExtractResult:
     url: str
     text: Optional[str]
@@ -51,7 +62,13 @@ def _should_render(text: Optional[str], cfg: PipelineConfig) -> bool:
         return True
     if not text:
         return True
-    return len(text.strip()) < cfg.extract.min_text_len
+    min_len = cfg.extract.min_text_len
+    if len(text) < min_len:
+        return True
+    # Only pay for a stripped copy when there is whitespace to strip.
+    if text[0].isspace() or text[-1].isspace():
+        return len(text.strip()) < min_len
+    return False
 
 
 _RENDER_STRONG_MARKERS = (
@@ -60,21 +77,45 @@ _RENDER_STRONG_MARKERS = (
     "查看全部",
     "点击展开",
 )
+# Bit flags: a strong marker decides on its own; "展开" and "更多" only
+# together.
+_RENDER_STRONG, _RENDER_EXPAND, _RENDER_MORE = 1, 2, 4
+_RENDER_PAIR = _RENDER_EXPAND | _RENDER_MORE
+_RENDER_MARKER_FLAGS = dict.fromkeys(_RENDER_STRONG_MARKERS, _RENDER_STRONG)
+_RENDER_MARKER_FLAGS.update({"展开": _RENDER_EXPAND, "更多": _RENDER_MORE})
+
+
+def _marker_automaton(flags: Dict[str, int]):
+    # One pass over the document for the whole marker set; without
+    # pyahocorasick the per-marker `in` scans (C memchr/two-way) are faster
+    # than any pure-python or regex alternation.
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for marker, flag in flags.items():
+        automaton.add_word(marker, flag)
+    automaton.make_automaton()
+    return automaton
+
+
+_RENDER_MARKER_AUTOMATON = _marker_automaton(_RENDER_MARKER_FLAGS)
 
 
 def _should_render_by_markers(html: Optional[str]) -> bool:
     if not html:
         return False
-    if any(marker in html for marker in _RENDER_STRONG_MARKERS):
-        return True
-    return "展开" in html and "更多" in html
-
-
-def _hostname(url: str) -> str:
-    try:
-        return (urlparse(url).hostname or "").lower()
-    except Exception:
-        return ""
+    if _RENDER_MARKER_AUTOMATON is None:
+        if any(marker in html for marker in _RENDER_STRONG_MARKERS):
+            return True
+        return "展开" in html and "更多" in html
+    seen = 0
+    for _, flag in _RENDER_MARKER_AUTOMATON.iter(html):
+        if flag == _RENDER_STRONG:
+            return True
+        seen |= flag
+        if seen == _RENDER_PAIR:
+            return True
+    return False
 
 
 _DOMAIN_WAIT_SELECTORS = (
@@ -194,52 +235,57 @@ def _pick_wait_selector(html: Optional[str], url: str, cfg: PipelineConfig) -> O
     return ", ".join(selectors)
 
 
-_X_SIGNUP_MARKERS = {
-    "New to X?",
-}
-
-_X_TRAILING_TOKENS = {
-    "·",
-    "Views",
-    "View",
-    "Replies",
-    "Reposts",
-    "Likes",
-}
+_X_TRAILING_TOKENS = frozenset(
+    {
+        "·",
+        "Views",
+        "View",
+        "Replies",
+        "Reposts",
+        "Likes",
+    }
+)
 
 _X_VIEW_RE = re.compile(r"^\d[\d,]*(?:\.\d+)?[KMB]?$")
+# A line that is exactly "New to X?" or starts with "sign up now". The search
+# form leads with a literal "\n" so re can skip ahead to line starts.
+_X_SIGNUP_LINE = r"[^\S\n]*(?:New to X\?[^\S\n]*(?:\n|\Z)|(?ai:sign up now))"
+_X_SIGNUP_FIRST_RE = re.compile(_X_SIGNUP_LINE)
+_X_SIGNUP_RE = re.compile(r"\n" + _X_SIGNUP_LINE)
+# Line boundaries str.splitlines() honours besides "\n".
+_OTHER_LINE_BREAKS = "\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+def _is_x_trailing_line(stripped: str) -> bool:
+    return (
+        not stripped
+        or stripped in _X_TRAILING_TOKENS
+        or stripped.endswith("Views")
+        or _X_VIEW_RE.match(stripped) is not None
+    )
 
 
 def _strip_x_boilerplate(text: str) -> str:
     if not text:
         return text
-    lines = text.splitlines()
-    for idx, line in enumerate(lines):
-        stripped = line.strip()
-        lowered = stripped.lower()
-        if stripped in _X_SIGNUP_MARKERS or lowered.startswith("sign up now"):
-            lines = lines[:idx]
+    if any(ch in text for ch in _OTHER_LINE_BREAKS):
+        text = "\n".join(text.splitlines())
+    if _X_SIGNUP_FIRST_RE.match(text):
+        return ""
+    match = _X_SIGNUP_RE.search(text)
+    end = match.start() if match else len(text)
+    return _drop_trailing_lines(text, end, _is_x_trailing_line)
+
+
+def _drop_trailing_lines(text: str, end: int, is_trailing) -> str:
+    # Walk back from end over lines whose stripped form is_trailing, without
+    # splitting the text; end is a line end (or a "\n" before a cut line).
+    while end > 0:
+        start = text.rfind("\n", 0, end) + 1
+        if not is_trailing(text[start:end].strip()):
             break
-    while lines and not lines[-1].strip():
-        lines.pop()
-    while lines:
-        stripped = lines[-1].strip()
-        if not stripped:
-            lines.pop()
-            continue
-        if stripped in _X_TRAILING_TOKENS:
-            lines.pop()
-            continue
-        if stripped.endswith("Views"):
-            lines.pop()
-            continue
-        if _X_VIEW_RE.match(stripped):
-            lines.pop()
-            continue
-        break
-    while lines and not lines[-1].strip():
-        lines.pop()
-    return "\n".join(lines)
+        end = start - 1
+    return text[: max(end, 0)]
 
 
 _CAPTCHA_STRONG_MARKERS = (
@@ -261,16 +307,23 @@ _CAPTCHA_STRONG_MARKERS = (
     "cf-chl",
     "cloudflare",
 )
+# One case-insensitive alternation over the original string: no lowered or
+# encoded copy of the document. Markers contained in another ("g-recaptcha")
+# add nothing and are left out.
+_CAPTCHA_RE = re.compile(
+    "|".join(
+        re.escape(m)
+        for m in _CAPTCHA_STRONG_MARKERS
+        if not any(o != m and o in m for o in _CAPTCHA_STRONG_MARKERS)
+    ),
+    re.IGNORECASE,
+)
 
 
 def _is_captcha_html(html: Optional[str]) -> bool:
     if not html:
         return False
-    lowered = html.lower()
-    for marker in _CAPTCHA_STRONG_MARKERS:
-        if marker in html or marker in lowered:
-            return True
-    return False
+    return _CAPTCHA_RE.search(html) is not None
 
 
 _ZUOWEN_FOOTER_MARKERS = (
@@ -281,35 +334,56 @@ _ZUOWEN_FOOTER_MARKERS = (
 )
 
 
+def _zuowen_cut(text: str) -> int:
+    # Start of the first line carrying a footer marker, or both "关于我们"
+    # and "|"; found with substring scans and mapped back to line starts.
+    cut = len(text)
+    for marker in _ZUOWEN_FOOTER_MARKERS:
+        idx = text.find(marker, 0, cut)
+        if idx != -1:
+            cut = text.rfind("\n", 0, idx) + 1
+    idx = text.find("关于我们", 0, cut)
+    while idx != -1:
+        start = text.rfind("\n", 0, idx) + 1
+        end = text.find("\n", idx)
+        if end == -1:
+            end = len(text)
+        if "|" in text[start:end]:
+            return start
+        idx = text.find("关于我们", end, cut)
+    return cut
+
+
 def _strip_zuowen_footer(text: str) -> str:
     if not text:
         return text
-    lines = text.splitlines()
-    cut_idx = None
-    for idx, line in enumerate(lines):
-        stripped = line.strip()
-        if not stripped:
-            continue
-        if "关于我们" in stripped and "|" in stripped:
-            cut_idx = idx
-            break
-        if any(marker in stripped for marker in _ZUOWEN_FOOTER_MARKERS):
-            cut_idx = idx
-            break
-    if cut_idx is not None:
-        lines = lines[:cut_idx]
-    while lines and not lines[-1].strip():
-        lines.pop()
-    return "\n".join(lines)
+    if any(ch in text for ch in _OTHER_LINE_BREAKS):
+        text = "\n".join(text.splitlines())
+    cut = _zuowen_cut(text)
+    end = cut - 1 if cut < len(text) else cut
+    return _drop_trailing_lines(text, end, lambda stripped: not stripped)
+
+
+_HOST_DEFAULT, _HOST_X, _HOST_ZUOWEN = 0, 1, 2
+
+
+@lru_cache(maxsize=4096)
+def _host_kind(url: str) -> int:
+    host = _hostname(url)
+    if host.endswith("x.com") or host.endswith("twitter.com"):
+        return _HOST_X
+    if host.endswith("zuowen.com"):
+        return _HOST_ZUOWEN
+    return _HOST_DEFAULT
 
 
 def _clean_text_for_url(text: Optional[str], url: str) -> Optional[str]:
     if not text:
         return text
-    host = _hostname(url)
-    if host.endswith("x.com") or host.endswith("twitter.com"):
+    kind = _host_kind(url)
+    if kind == _HOST_X:
         return _strip_x_boilerplate(text)
-    if host.endswith("zuowen.com"):
+    if kind == _HOST_ZUOWEN:
         return _strip_zuowen_footer(text)
     return text
 
@@ -319,13 +393,17 @@ def _is_html_output(output_format: str) -> bool:
     return fmt in {"html", "htm"}
 
 
+_BODY_CLOSE_RE = re.compile(r"</body>", re.IGNORECASE)
+_HTML_CLOSE_RE = re.compile(r"</html>", re.IGNORECASE)
+
+
 def _append_html_block(text: str, block: str) -> str:
     if not text:
         return block
-    if re.search(r"</body>", text, re.IGNORECASE):
-        return re.sub(r"</body>", block + "</body>", text, count=1, flags=re.IGNORECASE)
-    if re.search(r"</html>", text, re.IGNORECASE):
-        return re.sub(r"</html>", block + "</html>", text, count=1, flags=re.IGNORECASE)
+    m = _BODY_CLOSE_RE.search(text) or _HTML_CLOSE_RE.search(text)
+    if m:
+        cut = m.start()
+        return "".join((text[:cut], block, text[cut:]))
     return text + block
 
 
@@ -342,7 +420,11 @@ def _append_images_to_text(
             + "\n</ul></div>"
         )
         return _append_html_block(text, block)
-    return text + "\n\n[Images]\n" + "\n".join(images)
+    # One copy of text: join the block first, then concatenate once.
+    return "".join((text, "\n\n[Images]\n", "\n".join(images)))
+
+
+_X_VIDEO_ANCHORS = ("New to X?", "Sign up now", "Sign up")
 
 
 def _append_videos_to_text(
@@ -361,77 +443,145 @@ def _append_videos_to_text(
         return _append_html_block(text, block)
     else:
         block = "\n\n[Videos]\n" + "\n".join(videos)
-    host = _hostname(url)
-    if host.endswith("x.com") or host.endswith("twitter.com"):
-        for marker in ("New to X?", "Sign up now", "Sign up"):
+    # _strip_x_boilerplate already cut the signup footer, so these only hit
+    # incidental mentions. "Sign up" covers "Sign up now", so two scans
+    # settle the common case where neither exists.
+    if _host_kind(url) == _HOST_X and ("New to X?" in text or "Sign up" in text):
+        for marker in _X_VIDEO_ANCHORS:
             idx = text.find(marker)
             if idx != -1:
-                head = text[:idx].rstrip()
-                tail = text[idx:]
-                return head + block + "\n\n" + tail
+                return "".join((text[:idx].rstrip(), block, "\n\n", text[idx:]))
     return text + block
 
 
+def _images_for(html: str, url: str, abs_urls: Optional[Sequence[str]] = None) -> List[str]:
+    site = _classify_site(url)
+    if site == "huanqiu":
+        return collect_huanqiu_images(html, url)
+    if site == "wechat":
+        return list(
+            dict.fromkeys(
+                chain(_collect_wechat_images(html, url), collect_images(html, url, abs_urls))
+            )
+        )
+    return collect_images(html, url, abs_urls)
+
+
+def _elapsed_ms(start: Optional[int]) -> Optional[float]:
+    # Starts come from perf_counter_ns(): integer clock reads, one division.
+    if start is None:
+        return None
+    return (time.perf_counter_ns() - start) / 1e6
+
+
+_WORKER_PIPELINE = None
+
+
+def _init_batch_worker(config: PipelineConfig) -> None:
+    global _WORKER_PIPELINE
+    _WORKER_PIPELINE = Pipeline(config)
+
+
+def _extract_in_worker(url: str) -> ExtractResult:
+    return _WORKER_PIPELINE.extract_url(url)
+
+
+_PipelineT = TypeVar("_PipelineT", bound="Pipeline")
+
+
 class Pipeline:
     def __init__(self, config: PipelineConfig) -> None:
         self.config = config
+        self._executors: Dict[int, ThreadPoolExecutor] = {}
+        self._executor_lock = threading.Lock()
+
+    def _now(self) -> Optional[int]:
+        # Per-stage timings are opt-in; elapsed_ms is always measured.
+        return time.perf_counter_ns() if self.config.debug_timings else None
+
+    def _get_executor(self, max_workers: int) -> ThreadPoolExecutor:
+        # Reused across crawl_and_extract calls so worker threads (and the
+        # connections they keep alive) survive between batches. One pool per
+        # size: another caller may still be submitting to a pool of a
+        # different size, so none is shut down before close().
+        with self._executor_lock:
+            executor = self._executors.get(max_workers)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=max_workers)
+                self._executors[max_workers] = executor
+            return executor
+
+    def close(self) -> None:
+        with self._executor_lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=True)
+
+    def __enter__(self: _PipelineT) -> _PipelineT:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def aclose(self) -> None:
+        # Closes this loop's async HTTP clients, then the worker pools.
+        await close_async_clients()
+        await asyncio.to_thread(self.close)
+
+    async def __aenter__(self: _PipelineT) -> _PipelineT:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
 
     def _extract_with_images(
         self, html: str, url: str, media_urls: Optional[List[str]] = None
     ):
-        extract_start = time.monotonic()
-        html_output = _is_html_output(self.config.extract.output_format)
-        text, meta = extract_text_and_metadata(html, url, self.config.extract)
+        extract_start = self._now()
+        extract_cfg = self.config.extract
+        html_output = _is_html_output(extract_cfg.output_format)
+        text, meta = extract_text_and_metadata(html, url, extract_cfg)
         text = _clean_text_for_url(text, url)
-        extract_ms = (time.monotonic() - extract_start) * 1000.0
+        extract_ms = _elapsed_ms(extract_start)
+        include_images = extract_cfg.keep_images or extract_cfg.inline_images
+        include_videos = (
+            extract_cfg.keep_videos
+            or extract_cfg.append_videos
+            or extract_cfg.inline_videos
+        )
+        abs_urls = None
         images = []
         image_ms = None
-        if self.config.extract.keep_images or self.config.extract.inline_images:
-            image_start = time.monotonic()
-            if url and "huanqiu.com" in url:
-                images = collect_huanqiu_images(html, url)
-            elif url and "mp.weixin.qq.com" in url:
-                images = _collect_wechat_images(html, url)
-                seen = set(images)
-                for img in collect_images(html, url):
-                    if img in seen:
-                        continue
-                    seen.add(img)
-                    images.append(img)
-            else:
-                images = collect_images(html, url)
+        if include_images:
+            image_start = self._now()
+            if include_videos:
+                # Both collectors filter the same absolute-URL scan of the page.
+                abs_urls = _abs_urls_in(html)
+            images = _images_for(html, url, abs_urls)
             if (
                 text
                 and images
-                and self.config.extract.append_images
-                and not self.config.extract.inline_images
+                and extract_cfg.append_images
+                and not extract_cfg.inline_images
             ):
                 text = _append_images_to_text(text, images, html_output=html_output)
-            image_ms = (time.monotonic() - image_start) * 1000.0
+            image_ms = _elapsed_ms(image_start)
         videos = []
         video_ms = None
-        include_videos = (
-            self.config.extract.keep_videos
-            or self.config.extract.append_videos
-            or self.config.extract.inline_videos
-        )
         if include_videos:
-            video_start = time.monotonic()
-            videos = collect_videos(html, url)
+            video_start = self._now()
+            videos = collect_videos(html, url, abs_urls)
             if media_urls:
-                media_urls = filter_videos_for_url(url, media_urls)
-                seen = set(videos)
-                for media_url in media_urls:
-                    if media_url in seen:
-                        continue
-                    seen.add(media_url)
-                    videos.append(media_url)
-            should_append = self.config.extract.append_videos
+                videos = list(
+                    dict.fromkeys(chain(videos, filter_videos_for_url(url, media_urls)))
+                )
+            should_append = extract_cfg.append_videos
             if text and videos and should_append:
                 text = _append_videos_to_text(
                     text, videos, url, html_output=html_output
                 )
-            video_ms = (time.monotonic() - video_start) * 1000.0
+            video_ms = _elapsed_ms(video_start)
         return text, images, videos, meta, extract_ms, image_ms, video_ms
 
     def _render_with_media(self, url: str, html: Optional[str]) -> tuple[str, List[str]]:
@@ -441,164 +591,207 @@ class Pipeline:
             render_cfg = replace(render_cfg, wait_selector=wait_selector)
         return render_html_with_media(url, render_cfg, self.config.fetch.user_agent)
 
+    def _build_result(
+        self,
+        url,
+        start,
+        text,
+        used_render,
+        images,
+        videos,
+        *,
+        meta=None,
+        error=None,
+        status_code=None,
+        fetch_ms=None,
+        render_ms=None,
+        extract_ms=None,
+        image_ms=None,
+        video_ms=None,
+    ):
+        elapsed_ms = _elapsed_ms(start)
+        if meta is None:
+            meta = {}
+        return ExtractResult(
+            url=url,
+            text=text,
+            used_render=used_render,
+            error=error,
+            status_code=status_code,
+            images=images,
+            videos=videos,
+            title=meta.get("title"),
+            source=meta.get("source"),
+            elapsed_ms=elapsed_ms,
+            fetch_ms=fetch_ms,
+            render_ms=render_ms,
+            extract_ms=extract_ms,
+            image_ms=image_ms,
+            video_ms=video_ms,
+        )
+
     def extract_url(self, url: str) -> ExtractResult:
-        start = time.monotonic()
+        start = time.perf_counter_ns()
+        if self.config.render.mode == "always":
+            return self._extract_rendered(url, start)
 
-        def _build_result(
-            text,
-            used_render,
-            html,
-            images,
-            videos,
-            *,
-            meta=None,
-            error=None,
-            status_code=None,
-            fetch_ms=None,
-            render_ms=None,
-            extract_ms=None,
-            image_ms=None,
-            video_ms=None,
-        ):
-            elapsed_ms = (time.monotonic() - start) * 1000.0
-            if meta is None:
-                meta = (
-                    extract_metadata_from_html(html, url)
-                    if html and self.config.extract.with_metadata
-                    else {}
+        fetch_start = self._now()
+        try:
+            fetched = fetch_html(url, self.config.fetch)
+        except FetchError as exc:
+            fetch_ms = _elapsed_ms(fetch_start)
+            return self._extract_after_fetch_error(url, start, exc, fetch_ms)
+        fetch_ms = _elapsed_ms(fetch_start)
+        return self._extract_fetched(url, start, fetched, fetch_ms)
+
+    async def extract_url_async(
+        self, url: str, max_workers: Optional[int] = None
+    ) -> ExtractResult:
+        # Only the fetch runs on the event loop; render and extraction block,
+        # so they go to the pipeline's thread pool, sized like the caller's
+        # concurrency limit.
+        if max_workers is None:
+            max_workers = self.config.crawl.max_workers
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor(max(1, int(max_workers or 1)))
+        start = time.perf_counter_ns()
+        if self.config.render.mode == "always":
+            return await loop.run_in_executor(
+                executor, self._extract_rendered, url, start
+            )
+
+        fetch_start = self._now()
+        try:
+            fetched = await fetch_html_async(url, self.config.fetch)
+        except FetchError as exc:
+            fetch_ms = _elapsed_ms(fetch_start)
+            return await loop.run_in_executor(
+                executor, self._extract_after_fetch_error, url, start, exc, fetch_ms
+            )
+        fetch_ms = _elapsed_ms(fetch_start)
+        return await loop.run_in_executor(
+            executor, self._extract_fetched, url, start, fetched, fetch_ms
+        )
+
+    def _extract_rendered(self, url: str, start: int) -> ExtractResult:
+        try:
+            render_start = self._now()
+            rendered, media_urls = self._render_with_media(url, None)
+            render_ms = _elapsed_ms(render_start)
+            if _is_captcha_html(rendered):
+                return self._build_result(
+                    url,
+                    start,
+                    None,
+                    True,
+                    [],
+                    [],
+                    error="captcha_detected",
+                    render_ms=render_ms,
                 )
-            return ExtractResult(
-                url=url,
-                text=text,
-                used_render=used_render,
-                error=error,
-                status_code=status_code,
-                images=images,
-                videos=videos,
-                title=meta.get("title"),
-                source=meta.get("source"),
-                elapsed_ms=elapsed_ms,
-                fetch_ms=fetch_ms,
+            text, images, videos, meta, extract_ms, image_ms, video_ms = (
+                self._extract_with_images(rendered, url, media_urls=media_urls)
+            )
+            return self._build_result(
+                url,
+                start,
+                text,
+                True,
+                images,
+                videos,
+                meta=meta,
                 render_ms=render_ms,
                 extract_ms=extract_ms,
                 image_ms=image_ms,
                 video_ms=video_ms,
             )
+        except RenderError as exc:
+            render_ms = _elapsed_ms(render_start)
+            return self._build_result(
+                url, start, None, True, [], [], error=str(exc), render_ms=render_ms
+            )
 
-        if self.config.render.mode == "always":
+    def _extract_after_fetch_error(
+        self, url: str, start: int, exc: FetchError, fetch_ms: float
+    ) -> ExtractResult:
+        fetch_status = exc.status_code
+        fetch_error = str(exc)
+        if self.config.render.mode != "never":
             try:
-                render_start = time.monotonic()
+                render_start = self._now()
                 rendered, media_urls = self._render_with_media(url, None)
-                render_ms = (time.monotonic() - render_start) * 1000.0
+                render_ms = _elapsed_ms(render_start)
                 if _is_captcha_html(rendered):
-                    return _build_result(
+                    return self._build_result(
+                        url,
+                        start,
                         None,
                         True,
-                        None,
                         [],
                         [],
                         error="captcha_detected",
+                        status_code=fetch_status,
+                        fetch_ms=fetch_ms,
                         render_ms=render_ms,
                     )
                 text, images, videos, meta, extract_ms, image_ms, video_ms = (
                     self._extract_with_images(rendered, url, media_urls=media_urls)
                 )
-                return _build_result(
+                return self._build_result(
+                    url,
+                    start,
                     text,
                     True,
-                    rendered,
                     images,
                     videos,
                     meta=meta,
+                    status_code=fetch_status,
+                    fetch_ms=fetch_ms,
                     render_ms=render_ms,
                     extract_ms=extract_ms,
                     image_ms=image_ms,
                     video_ms=video_ms,
                 )
-            except RenderError as exc:
-                render_ms = (time.monotonic() - render_start) * 1000.0
-                return _build_result(
-                    None, True, None, [], [], error=str(exc), render_ms=render_ms
-                )
-
-        fetch_ms = None
-        fetch_status = None
-        try:
-            fetch_start = time.monotonic()
-            fetched = fetch_html(url, self.config.fetch)
-            fetch_ms = (time.monotonic() - fetch_start) * 1000.0
-            fetch_status = fetched.status_code
-            html = fetched.html
-            if _is_captcha_html(html):
-                return _build_result(
-                    None,
-                    False,
+            except RenderError as render_exc:
+                render_ms = _elapsed_ms(render_start)
+                return self._build_result(
+                    url,
+                    start,
                     None,
+                    True,
                     [],
                     [],
-                    error="captcha_detected",
+                    error=f"{fetch_error}; render failed: {render_exc}",
                     status_code=fetch_status,
                     fetch_ms=fetch_ms,
+                    render_ms=render_ms,
                 )
-        except FetchError as exc:
-            if fetch_ms is None:
-                fetch_ms = (time.monotonic() - fetch_start) * 1000.0
-            fetch_status = exc.status_code
-            fetch_error = str(exc)
-            if self.config.render.mode != "never":
-                try:
-                    render_start = time.monotonic()
-                    rendered, media_urls = self._render_with_media(url, None)
-                    render_ms = (time.monotonic() - render_start) * 1000.0
-                    if _is_captcha_html(rendered):
-                        return _build_result(
-                            None,
-                            True,
-                            None,
-                            [],
-                            [],
-                            error="captcha_detected",
-                            status_code=fetch_status,
-                            fetch_ms=fetch_ms,
-                            render_ms=render_ms,
-                        )
-                    text, images, videos, meta, extract_ms, image_ms, video_ms = (
-                        self._extract_with_images(rendered, url, media_urls=media_urls)
-                    )
-                    return _build_result(
-                        text,
-                        True,
-                        rendered,
-                        images,
-                        videos,
-                        meta=meta,
-                        status_code=fetch_status,
-                        fetch_ms=fetch_ms,
-                        render_ms=render_ms,
-                        extract_ms=extract_ms,
-                        image_ms=image_ms,
-                        video_ms=video_ms,
-                    )
-                except RenderError as render_exc:
-                    render_ms = (time.monotonic() - render_start) * 1000.0
-                    return _build_result(
-                        None,
-                        True,
-                        None,
-                        [],
-                        [],
-                        error=f"{fetch_error}; render failed: {render_exc}",
-                        status_code=fetch_status,
-                        fetch_ms=fetch_ms,
-                        render_ms=render_ms,
-                    )
-            return _build_result(
+        return self._build_result(
+            url,
+            start,
+            None,
+            False,
+            [],
+            [],
+            error=fetch_error,
+            status_code=fetch_status,
+            fetch_ms=fetch_ms,
+        )
+
+    def _extract_fetched(
+        self, url: str, start: int, fetched: FetchResult, fetch_ms: float
+    ) -> ExtractResult:
+        fetch_status = fetched.status_code
+        html = fetched.html
+        if _is_captcha_html(html):
+            return self._build_result(
+                url,
+                start,
                 None,
                 False,
-                None,
                 [],
                 [],
-                error=fetch_error,
+                error="captcha_detected",
                 status_code=fetch_status,
                 fetch_ms=fetch_ms,
             )
@@ -615,17 +808,18 @@ class Pipeline:
         fetch_video_ms = video_ms
         if _should_render(text, self.config) or _should_render_by_markers(html):
             try:
-                render_start = time.monotonic()
+                render_start = self._now()
                 rendered, media_urls = self._render_with_media(url, html)
-                render_ms = (time.monotonic() - render_start) * 1000.0
+                render_ms = _elapsed_ms(render_start)
                 text, images, videos, meta, extract_ms, image_ms, video_ms = (
                     self._extract_with_images(rendered, url, media_urls=media_urls)
                 )
                 if not text:
-                    return _build_result(
+                    return self._build_result(
+                        url,
+                        start,
                         fetch_text,
                         False,
-                        html,
                         fetch_images,
                         fetch_videos,
                         meta=fetch_meta,
@@ -636,10 +830,11 @@ class Pipeline:
                         image_ms=fetch_image_ms,
                         video_ms=fetch_video_ms,
                     )
-                return _build_result(
+                return self._build_result(
+                    url,
+                    start,
                     text,
                     True,
-                    rendered,
                     images,
                     videos,
                     meta=meta,
@@ -651,11 +846,12 @@ class Pipeline:
                     video_ms=video_ms,
                 )
             except RenderError as exc:
-                render_ms = (time.monotonic() - render_start) * 1000.0
-                return _build_result(
+                render_ms = _elapsed_ms(render_start)
+                return self._build_result(
+                    url,
+                    start,
                     text,
                     False,
-                    html,
                     images,
                     videos,
                     meta=meta,
@@ -668,10 +864,11 @@ class Pipeline:
                     video_ms=video_ms,
                 )
 
-        return _build_result(
+        return self._build_result(
+            url,
+            start,
             text,
             False,
-            html,
             images,
             videos,
             meta=meta,
@@ -682,36 +879,103 @@ class Pipeline:
             video_ms=video_ms,
         )
 
+    def _prewarm_render(self, max_workers) -> None:
+        # Start Playwright while list pages are crawled, so its cold start is
+        # off the first rendering URL when renders are certain or a
+        # concurrent batch is likely to need one.
+        mode = self.config.render.mode
+        if mode == "always" or (mode == "auto" and int(max_workers or 1) > 1):
+            prewarm_browser(self.config.render)
+
     def crawl(self, start_urls: Iterable[str]) -> List[str]:
         return crawl_urls(start_urls, self.config.fetch, self.config.crawl)
 
     def crawl_and_extract(
         self, start_urls: Iterable[str], max_workers: Optional[int] = None
     ) -> List[ExtractResult]:
+        if max_workers is None:
+            max_workers = self.config.crawl.max_workers
+        self._prewarm_render(max_workers)
         urls = list(self.crawl(start_urls))
         if not urls:
             return []
 
-        if max_workers is None:
-            max_workers = self.config.crawl.max_workers
         max_workers = max(1, int(max_workers or 1))
         if max_workers <= 1:
             return [self.extract_url(url) for url in urls]
 
         results: List[Optional[ExtractResult]] = [None] * len(urls)
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(self.extract_url, url): idx
-                for idx, url in enumerate(urls)
-            }
-            for future in as_completed(futures):
-                idx = futures[future]
+        executor = self._get_executor(max_workers)
+        futures = {
+            executor.submit(self.extract_url, url): idx
+            for idx, url in enumerate(urls)
+        }
+        for future in as_completed(futures):
+            idx = futures[future]
+            try:
+                results[idx] = future.result()
+            except Exception as exc:
+                results[idx] = ExtractResult(
+                    url=urls[idx],
+                    text=None,
+                    error=str(exc),
+                )
+        return [r for r in results if r is not None]
+
+    async def crawl_and_extract_async(
+        self, start_urls: Iterable[str], max_workers: Optional[int] = None
+    ) -> List[ExtractResult]:
+        if max_workers is None:
+            max_workers = self.config.crawl.max_workers
+        self._prewarm_render(max_workers)
+        workers = max(1, int(max_workers or 1))
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor(workers)
+        urls = await loop.run_in_executor(executor, self.crawl, list(start_urls))
+        if not urls:
+            return []
+
+        limit = asyncio.Semaphore(workers)
+
+        async def _one(url: str) -> ExtractResult:
+            async with limit:
+                return await self.extract_url_async(url, max_workers=workers)
+
+        results = await asyncio.gather(
+            *(_one(url) for url in urls), return_exceptions=True
+        )
+        return [
+            ExtractResult(url=url, text=None, error=str(result))
+            if isinstance(result, BaseException)
+            else result
+            for url, result in zip(urls, results)
+        ]
+
+    def extract_batch(
+        self, urls: Iterable[str], max_workers: Optional[int] = None
+    ) -> List[ExtractResult]:
+        urls = list(urls)
+        if not urls:
+            return []
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max(1, int(max_workers or 1)), len(urls))
+        if max_workers <= 1:
+            return [self.extract_url(url) for url in urls]
+
+        # Extraction is CPU-bound, so spread URLs over processes; each worker
+        # builds its Pipeline once from the pickled config.
+        results: List[ExtractResult] = []
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_batch_worker,
+            initargs=(self.config,),
+        ) as executor:
+            futures = [executor.submit(_extract_in_worker, url) for url in urls]
+            for url, future in zip(urls, futures):
                 try:
-                    results[idx] = future.result()
+                    results.append(future.result())
                 except Exception as exc:
-                    results[idx] = ExtractResult(
-                        url=urls[idx],
-                        text=None,
-                        error=str(exc),
-                    )
-        return [r for r in results if r is not None]
+                    results.append(ExtractResult(url=url, text=None, error=str(exc)))
+        return results
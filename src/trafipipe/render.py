@@ -1,6 +1,12 @@
 from __future__ import annotations
 
 import atexit
+import os
+import queue
+import re
+import threading
+import weakref
+from concurrent.futures import Future
 from typing import List, Tuple
 
 from .config import RenderConfig
@@ -20,6 +26,33 @@ _BROWSER = None
 _BROWSER_PROXY = None
 _CONTEXT = None
 _CONTEXT_KEY = None
+# One idle page kept on the reused context; renders are serialized on the
+# render thread, so a single slot is a full pool.
+_IDLE_PAGE = None
+_IDLE_PAGE_CONTEXT = None
+
+# The Playwright sync API is bound to the thread that started it, so every
+# browser call runs on one dedicated thread; concurrent crawl/async workers
+# queue their renders there instead of racing on the shared browser.
+_RENDER_THREAD = None
+_RENDER_THREAD_LOCK = threading.Lock()
+_RENDER_JOBS: queue.SimpleQueue = queue.SimpleQueue()
+_RENDER_LOCAL = threading.local()
+# (seen, urls) for the render in flight; set only while a capture_media render
+# runs. Renders are serialized, so one slot serves the shared listener.
+_MEDIA_SINK = None
+# Contexts that already carry the _collect_media listener: registered once per
+# context, and only on contexts a capture_media render has used.
+_MEDIA_CONTEXTS: "weakref.WeakSet" = weakref.WeakSet()
+
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+# Image, font and media files by path extension: a quick answer for the common
+# case before falling back to the request's resource_type.
+_BLOCKED_RESOURCE_RE = re.compile(
+    r"^[^?#]*\.(?:png|jpe?g|gif|webp|avif|bmp|ico|woff2?|ttf|otf|eot"
+    r"|mp4|webm|mov|m4v|mpe?g|ogv|mp3|m4a|wav)(?:[?#]|$)",
+    re.IGNORECASE,
+)
 
 _MEDIA_EXTENSIONS = (
     ".mp4",
@@ -35,6 +68,9 @@ _MEDIA_EXTENSIONS = (
 
 def _close_browser() -> None:
     global _PLAYWRIGHT, _BROWSER, _BROWSER_PROXY, _CONTEXT, _CONTEXT_KEY
+    global _IDLE_PAGE, _IDLE_PAGE_CONTEXT
+    _IDLE_PAGE = None
+    _IDLE_PAGE_CONTEXT = None
     if _CONTEXT is not None:
         try:
             _CONTEXT.close()
@@ -68,7 +104,80 @@ def _get_browser(proxy):
     return _BROWSER
 
 
-atexit.register(_close_browser)
+def _render_worker(jobs: queue.SimpleQueue) -> None:
+    _RENDER_LOCAL.owner = True
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        future, fn, args = job
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            future.set_result(fn(*args))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+
+def _on_render_thread(fn, *args):
+    if getattr(_RENDER_LOCAL, "owner", False):
+        return fn(*args)
+    return _submit_render(fn, *args).result()
+
+
+def _submit_render(fn, *args) -> Future:
+    global _RENDER_THREAD
+    with _RENDER_THREAD_LOCK:
+        if _RENDER_THREAD is None:
+            # Daemon so it never blocks exit; atexit still closes the browser
+            # on it before interpreter shutdown.
+            _RENDER_THREAD = threading.Thread(
+                target=_render_worker,
+                args=(_RENDER_JOBS,),
+                name="trafipipe-render",
+                daemon=True,
+            )
+            _RENDER_THREAD.start()
+    future: Future = Future()
+    _RENDER_JOBS.put((future, fn, args))
+    return future
+
+
+def _shutdown_render_thread() -> None:
+    global _RENDER_THREAD
+    with _RENDER_THREAD_LOCK:
+        thread, _RENDER_THREAD = _RENDER_THREAD, None
+    if thread is None:
+        return
+    done: Future = Future()
+    _RENDER_JOBS.put((done, _close_browser, ()))
+    _RENDER_JOBS.put(None)
+    thread.join()
+
+
+atexit.register(_shutdown_render_thread)
+
+
+def _reset_after_fork() -> None:
+    # A forked child (e.g. extract_batch's process pool) inherits the parent's
+    # render thread handle and browser objects but none of the threads behind
+    # them; start from scratch rather than queue onto a thread that is not there.
+    global _RENDER_THREAD, _RENDER_THREAD_LOCK, _RENDER_JOBS, _RENDER_LOCAL, _MEDIA_SINK
+    global _PLAYWRIGHT, _BROWSER, _BROWSER_PROXY, _CONTEXT, _CONTEXT_KEY
+    global _IDLE_PAGE, _IDLE_PAGE_CONTEXT
+    _RENDER_THREAD = None
+    _RENDER_THREAD_LOCK = threading.Lock()
+    _RENDER_JOBS = queue.SimpleQueue()
+    _RENDER_LOCAL = threading.local()
+    _MEDIA_SINK = None
+    _MEDIA_CONTEXTS.clear()
+    _PLAYWRIGHT = _BROWSER = _BROWSER_PROXY = None
+    _CONTEXT = _CONTEXT_KEY = None
+    _IDLE_PAGE = _IDLE_PAGE_CONTEXT = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
 
 
 def _cookies_key(cookies):
@@ -105,24 +214,50 @@ def _context_key(config: RenderConfig, user_agent: str, proxy):
     )
 
 
+def _collect_media(request) -> None:
+    sink = _MEDIA_SINK
+    if sink is None:
+        return
+    req_url = request.url
+    if request.resource_type == "media" or _looks_like_media_url(req_url):
+        seen, urls = sink
+        if req_url not in seen:
+            seen.add(req_url)
+            urls.append(req_url)
+
+
+def _new_context(browser, config: RenderConfig, user_agent: str):
+    context = browser.new_context(
+        user_agent=user_agent,
+        extra_http_headers=config.extra_headers or None,
+    )
+    if config.cookies:
+        context.add_cookies(config.cookies)
+    if config.block_resources:
+        _block_static_resources(context)
+    return context
+
+
+def _route_static_resources(route, request) -> None:
+    if (
+        _BLOCKED_RESOURCE_RE.match(request.url)
+        or request.resource_type in _BLOCKED_RESOURCE_TYPES
+    ):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _block_static_resources(context) -> None:
+    # Extensionless CDN and query-string assets only show up as blocked by
+    # resource_type, so every request goes through the handler.
+    context.route("**/*", _route_static_resources)
+
+
 def _get_context(browser, config: RenderConfig, user_agent: str, proxy):
     global _CONTEXT, _CONTEXT_KEY
     if not getattr(config, "reuse_context", False):
-        context = browser.new_context(
-            user_agent=user_agent,
-            extra_http_headers=config.extra_headers or None,
-        )
-        if config.cookies:
-            context.add_cookies(config.cookies)
-        if config.block_resources:
-            def _route_handler(route, request):
-                if request.resource_type in {"image", "media", "font"}:
-                    route.abort()
-                else:
-                    route.continue_()
-
-            context.route("**/*", _route_handler)
-        return context
+        return _new_context(browser, config, user_agent)
 
     key = _context_key(config, user_agent, proxy)
     if _CONTEXT is not None and _CONTEXT_KEY == key:
@@ -134,30 +269,37 @@ def _get_context(browser, config: RenderConfig, user_agent: str, proxy):
         except Exception:
             pass
 
-    context = browser.new_context(
-        user_agent=user_agent,
-        extra_http_headers=config.extra_headers or None,
-    )
-    if config.cookies:
-        context.add_cookies(config.cookies)
-    if config.block_resources:
-        def _route_handler(route, request):
-            if request.resource_type in {"image", "media", "font"}:
-                route.abort()
-            else:
-                route.continue_()
-
-        context.route("**/*", _route_handler)
-
+    context = _new_context(browser, config, user_agent)
     _CONTEXT = context
     _CONTEXT_KEY = key
     return context
 
 
+def _take_page(context):
+    global _IDLE_PAGE, _IDLE_PAGE_CONTEXT
+    page, _IDLE_PAGE = _IDLE_PAGE, None
+    owner, _IDLE_PAGE_CONTEXT = _IDLE_PAGE_CONTEXT, None
+    if page is not None and owner is context and not page.is_closed():
+        return page
+    return context.new_page()
+
+
+def _release_page(context, page) -> bool:
+    global _IDLE_PAGE, _IDLE_PAGE_CONTEXT
+    try:
+        # Stop the old document's scripts and requests before parking it.
+        page.goto("about:blank")
+    except Exception:
+        return False
+    _IDLE_PAGE = page
+    _IDLE_PAGE_CONTEXT = context
+    return True
+
+
 def _looks_like_media_url(url: str) -> bool:
     lowered = url.lower()
     base = lowered.split("?", 1)[0].split("#", 1)[0]
-    if any(base.endswith(ext) for ext in _MEDIA_EXTENSIONS):
+    if base.endswith(_MEDIA_EXTENSIONS):
         return True
     if "video.twimg.com" in lowered:
         return True
@@ -169,6 +311,7 @@ def _looks_like_media_url(url: str) -> bool:
 def _render_html(
     url: str, config: RenderConfig, user_agent: str, capture_media: bool
 ) -> Tuple[str, List[str]]:
+    global _MEDIA_SINK
     if not _HAS_PLAYWRIGHT:
         raise RenderUnavailable("playwright is not installed")
 
@@ -178,21 +321,14 @@ def _render_html(
     try:
         browser = _get_browser(proxy)
         context = _get_context(browser, config, user_agent, proxy)
-        page = context.new_page()
+        reuse = getattr(config, "reuse_context", False)
+        page = _take_page(context) if reuse else context.new_page()
         try:
             if capture_media:
-                seen = set()
-
-                def _on_request(request):
-                    req_url = request.url
-                    if request.resource_type == "media" or _looks_like_media_url(req_url):
-                        if req_url in seen:
-                            return
-                        seen.add(req_url)
-                        media_urls.append(req_url)
-
-                page.on("request", _on_request)
-
+                if context not in _MEDIA_CONTEXTS:
+                    context.on("request", _collect_media)
+                    _MEDIA_CONTEXTS.add(context)
+                _MEDIA_SINK = (set(), media_urls)
             page.goto(
                 url, wait_until="domcontentloaded", timeout=int(config.timeout * 1000)
             )
@@ -211,11 +347,13 @@ def _render_html(
 
             content = page.content()
         finally:
-            try:
-                page.close()
-            except Exception:
-                pass
-            if not getattr(config, "reuse_context", False):
+            _MEDIA_SINK = None
+            if not (reuse and _release_page(context, page)):
+                try:
+                    page.close()
+                except Exception:
+                    pass
+            if not reuse:
                 try:
                     context.close()
                 except Exception:
@@ -225,12 +363,25 @@ def _render_html(
         raise RenderError(f"render failed: {exc}") from exc
 
 
+def prewarm_browser(config: RenderConfig) -> None:
+    # Queue the browser start on the render thread without waiting for it.
+    if not _HAS_PLAYWRIGHT:
+        return
+    proxy = config.proxy.to_playwright() if config.proxy else None
+    # A failed prewarm is retried (and reported) by the first real render.
+    _submit_render(_get_browser, proxy).add_done_callback(_ignore_result)
+
+
+def _ignore_result(future: Future) -> None:
+    future.exception()
+
+
 def render_html(url: str, config: RenderConfig, user_agent: str) -> str:
-    content, _ = _render_html(url, config, user_agent, capture_media=False)
+    content, _ = _on_render_thread(_render_html, url, config, user_agent, False)
     return content
 
 
 def render_html_with_media(
     url: str, config: RenderConfig, user_agent: str
 ) -> Tuple[str, List[str]]:
-    return _render_html(url, config, user_agent, capture_media=True)
+    return _on_render_thread(_render_html, url, config, user_agent, True)
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import csv
-import datetime as dt
 import hashlib
 import re
 import time
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from urllib.parse import urlparse
 
-from trafipipe import Pipeline, PipelineConfig
+from trafipipe import ExtractResult, Pipeline, PipelineConfig
+
+try:
+    import xlsxwriter  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    xlsxwriter = None
 
 try:
     from openpyxl import Workbook  # type: ignore
@@ -17,7 +23,7 @@ except Exception:
     Workbook = None
 
 
-def _read_urls(path: Path) -> List[str]:
+def _read_urls(path: Path) -> List[Tuple[str, str, str]]:
     urls: List[str] = []
     for raw in path.read_text(encoding="utf-8").splitlines():
         line = raw.strip()
@@ -26,15 +32,20 @@ def _read_urls(path: Path) -> List[str]:
         url = line.split()[0].strip()
         if url:
             urls.append(url)
-    return urls
+    # Repeated lines would refetch and rewrite the same page; keep first order.
+    # Parsed once here: the host gate, interleaving and slug all need the parts.
+    out: List[Tuple[str, str, str]] = []
+    for url in dict.fromkeys(urls):
+        parsed = urlparse(url)
+        out.append((url, parsed.netloc, parsed.path))
+    return out
 
 
 _SAFE_CHARS_RE = re.compile(r"[^A-Za-z0-9._-]+")
 
 
-def _slug_for_url(url: str, max_len: int = 80) -> str:
-    parsed = urlparse(url)
-    raw = (parsed.netloc + parsed.path).strip("/")
+def _slug_for_url(url: str, netloc: str, path: str, max_len: int = 80) -> str:
+    raw = (netloc + path).strip("/")
     if not raw:
         raw = "url"
     raw = raw.replace("/", "_")
@@ -58,6 +69,8 @@ def _build_config(
     append_videos: bool,
 ) -> PipelineConfig:
     cfg = PipelineConfig()
+    # The report has per-stage columns; they stay None unless this is on.
+    cfg.debug_timings = True
     cfg.render.mode = render
     cfg.render.wait_selector = wait_selector
     cfg.render.block_resources = block_resources
@@ -73,27 +86,133 @@ def _build_config(
 
 
 def _write_md(path: Path, text: Optional[str]) -> None:
-    content = text or ""
-    path.write_text(content, encoding="utf-8")
+    # One encode and one write; the text-mode wrapper adds nothing here.
+    path.write_bytes((text or "").encode("utf-8"))
+
+
+class _Row(NamedTuple):
+    # Field order is the excel/csv column order.
+    idx: int
+    status: str
+    url: str
+    md_file: str
+    title: Optional[str]
+    source: Optional[str]
+    text_len: int
+    images: int
+    videos: int
+    used_render: bool
+    elapsed_ms: Optional[float]
+    fetch_ms: Optional[float]
+    render_ms: Optional[float]
+    extract_ms: Optional[float]
+    image_ms: Optional[float]
+    video_ms: Optional[float]
+    error: Optional[str]
+
+
+class _HostGate:
+    # Spaces requests to the same host by `delay` seconds; other hosts proceed.
+    # Slots are reserved without awaiting, so the event loop needs no lock.
+    def __init__(self, delay: float) -> None:
+        self._delay = delay
+        self._next: Dict[str, float] = {}
+
+    async def wait(self, host: str) -> None:
+        if not self._delay:
+            return
+        now = time.monotonic()
+        start = max(now, self._next.get(host, 0.0))
+        self._next[host] = start + self._delay
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+def _interleave_by_host(
+    items: List[Tuple[int, str, str, str]]
+) -> List[Tuple[int, str, str, str]]:
+    # Round-robin across hosts so a file grouped by site keeps every worker busy
+    # instead of queueing them all behind one host's gate.
+    buckets: Dict[str, deque] = {}
+    for item in items:
+        buckets.setdefault(item[2], deque()).append(item)
+    queues = list(buckets.values())
+    out: List[Tuple[int, str, str, str]] = []
+    while queues:
+        for q in queues:
+            out.append(q.popleft())
+        queues = [q for q in queues if q]
+    return out
+
+
+async def _process_url(
+    pipeline: Pipeline,
+    gate: _HostGate,
+    limit: asyncio.Semaphore,
+    workers: int,
+    item: Tuple[int, str, str, str],
+    md_dir: Path,
+    out_dir: Path,
+) -> _Row:
+    idx, url, netloc, path = item
+    async with limit:
+        # Reserve the host slot only once a worker is free, so the gap is
+        # measured from when fetches actually start.
+        await gate.wait(netloc)
+        try:
+            result = await pipeline.extract_url_async(url, max_workers=workers)
+        except Exception as exc:
+            result = ExtractResult(url=url, text=None, error=str(exc))
+    # Empty and error rows get no file; the report leaves md_file blank.
+    md_file = ""
+    if result.text:
+        md_path = md_dir / f"{idx:04d}_{_slug_for_url(url, netloc, path)}.md"
+        _write_md(md_path, result.text)
+        md_file = md_path.relative_to(out_dir).as_posix()
+
+    status = "ok" if result.text else ("error" if result.error else "empty")
+    return _Row(
+        idx=idx,
+        status=status,
+        url=url,
+        md_file=md_file,
+        title=result.title,
+        source=result.source,
+        text_len=len(result.text) if result.text else 0,
+        images=len(result.images) if result.images else 0,
+        videos=len(result.videos) if result.videos else 0,
+        used_render=result.used_render,
+        elapsed_ms=result.elapsed_ms,
+        fetch_ms=result.fetch_ms,
+        render_ms=result.render_ms,
+        extract_ms=result.extract_ms,
+        image_ms=result.image_ms,
+        video_ms=result.video_ms,
+        error=result.error,
+    )
 
 
-def _summaries(rows: List[Dict[str, object]]) -> Dict[str, object]:
-    total = len(rows)
-    ok = sum(1 for r in rows if r.get("status") == "ok")
-    err = sum(1 for r in rows if r.get("status") == "error")
-    empty = sum(1 for r in rows if r.get("status") == "empty")
-    elapsed = [r["elapsed_ms"] for r in rows if isinstance(r.get("elapsed_ms"), (int, float))]
-    avg_elapsed = sum(elapsed) / len(elapsed) if elapsed else 0.0
+def _summaries(rows: List[_Row]) -> Dict[str, object]:
+    counts = {"ok": 0, "error": 0, "empty": 0}
+    elapsed_sum = 0.0
+    elapsed_n = 0
+    for r in rows:
+        if r.status in counts:
+            counts[r.status] += 1
+        elapsed = r.elapsed_ms
+        if isinstance(elapsed, (int, float)):
+            elapsed_sum += elapsed
+            elapsed_n += 1
     return {
-        "total": total,
-        "ok": ok,
-        "error": err,
-        "empty": empty,
-        "avg_elapsed_ms": avg_elapsed,
+        "total": len(rows),
+        "ok": counts["ok"],
+        "error": counts["error"],
+        "empty": counts["empty"],
+        "avg_elapsed_ms": elapsed_sum / elapsed_n if elapsed_n else 0.0,
     }
 
 
-def _write_report(path: Path, rows: List[Dict[str, object]], meta: Dict[str, str]) -> None:
+def _write_report(path: Path, rows: List[_Row], meta: Dict[str, str]) -> None:
     summary = _summaries(rows)
     lines = [
         "# Batch Extract Report",
@@ -116,53 +235,46 @@ def _write_report(path: Path, rows: List[Dict[str, object]], meta: Dict[str, str
         "| --- | ------ | --- | ------- | -------- | ------ | ------ | ----- |",
     ]
     for row in rows:
-        err = str(row.get("error") or "")
+        err = str(row.error or "")
         if len(err) > 120:
             err = err[:117] + "..."
         lines.append(
-            f"| {row.get('idx')} | {row.get('status')} | {row.get('url')} | "
-            f"{row.get('md_file')} | {row.get('text_len')} | "
-            f"{row.get('images')} | {row.get('videos')} | {err} |"
+            f"| {row.idx} | {row.status} | {row.url} | "
+            f"{row.md_file} | {row.text_len} | "
+            f"{row.images} | {row.videos} | {err} |"
         )
-    path.write_text("\n".join(lines), encoding="utf-8")
-
-
-def _write_excel(path: Path, rows: List[Dict[str, object]]) -> Tuple[Path, bool]:
-    headers = [
-        "idx",
-        "status",
-        "url",
-        "md_file",
-        "title",
-        "source",
-        "text_len",
-        "images",
-        "videos",
-        "used_render",
-        "elapsed_ms",
-        "fetch_ms",
-        "render_ms",
-        "extract_ms",
-        "image_ms",
-        "video_ms",
-        "error",
-    ]
+    path.write_bytes("\n".join(lines).encode("utf-8"))
+
+
+def _write_excel(path: Path, rows: List[_Row]) -> Tuple[Path, bool]:
+    headers = list(_Row._fields)
+
+    if xlsxwriter is not None:
+        # constant_memory flushes each row as it is written; keep URLs as plain
+        # strings like the openpyxl path instead of turning them into links.
+        book = xlsxwriter.Workbook(str(path), {"constant_memory": True, "strings_to_urls": False})
+        sheet = book.add_worksheet("results")
+        sheet.write_row(0, 0, headers)
+        for r, row in enumerate(rows, start=1):
+            sheet.write_row(r, 0, row)
+        book.close()
+        return path, True
 
     if Workbook is None:
         csv_path = path.with_suffix(".csv")
-        with csv_path.open("w", encoding="utf-8", newline="") as f:
+        with csv_path.open("w", encoding="utf-8", newline="", buffering=1 << 17) as f:
             writer = csv.writer(f)
             writer.writerow(headers)
-            for row in rows:
-                writer.writerow([row.get(h, "") for h in headers])
+            writer.writerows(rows)
         return csv_path, False
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "results"
+    # Write-only streams rows to the sheet XML instead of keeping a Cell per
+    # value; openpyxl serializes through lxml, which trafilatura already pulls in.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("results")
     ws.append(headers)
     for row in rows:
-        ws.append([row.get(h, "") for h in headers])
+        ws.append(list(row))
     wb.save(path)
     return path, True
 
@@ -182,15 +294,17 @@ def run_batch(
     append_videos: bool = False,
     limit: Optional[int] = None,
     sleep_seconds: float = 0.0,
+    workers: int = 16,
 ) -> Path:
     input_path = input_path.expanduser().resolve()
+    workers = max(1, workers)
     urls = _read_urls(input_path)
     if limit:
         urls = urls[:limit]
     if not urls:
         raise SystemExit("no urls found")
 
-    stamp = dt.datetime.now().strftime("%Y%m%d-%H%M%S")
+    stamp = time.strftime("%Y%m%d-%H%M%S")
     out_dir = out_dir.resolve() if out_dir else Path("outputs") / f"run-{stamp}"
     md_dir = out_dir / "md"
     md_dir.mkdir(parents=True, exist_ok=True)
@@ -206,41 +320,24 @@ def run_batch(
         keep_videos=keep_videos,
         append_videos=append_videos,
     )
-    pipeline = Pipeline(cfg)
-
-    rows: List[Dict[str, object]] = []
-    for idx, url in enumerate(urls, start=1):
-        slug = _slug_for_url(url)
-        md_name = f"{idx:04d}_{slug}.md"
-        md_path = md_dir / md_name
-        result = pipeline.extract_url(url)
-        _write_md(md_path, result.text)
-
-        status = "ok" if result.text else ("error" if result.error else "empty")
-        rows.append(
-            {
-                "idx": idx,
-                "status": status,
-                "url": url,
-                "md_file": md_path.relative_to(out_dir).as_posix(),
-                "title": result.title,
-                "source": result.source,
-                "text_len": len(result.text) if result.text else 0,
-                "images": len(result.images) if result.images else 0,
-                "videos": len(result.videos) if result.videos else 0,
-                "used_render": result.used_render,
-                "elapsed_ms": result.elapsed_ms,
-                "fetch_ms": result.fetch_ms,
-                "render_ms": result.render_ms,
-                "extract_ms": result.extract_ms,
-                "image_ms": result.image_ms,
-                "video_ms": result.video_ms,
-                "error": result.error,
-            }
-        )
-
-        if sleep_seconds:
-            time.sleep(sleep_seconds)
+    async def _extract_all() -> List[_Row]:
+        gate = _HostGate(sleep_seconds)
+        limit = asyncio.Semaphore(workers)
+        # async with closes the loop's HTTP clients before asyncio.run ends.
+        async with Pipeline(cfg) as pipeline:
+            return await asyncio.gather(
+                *(
+                    _process_url(pipeline, gate, limit, workers, item, md_dir, out_dir)
+                    for item in _interleave_by_host(
+                        [(idx, *entry) for idx, entry in enumerate(urls, start=1)]
+                    )
+                )
+            )
+
+    # Fetches share one event loop; sleep_seconds is a per-host gap, not a
+    # pause between every URL.
+    rows = asyncio.run(_extract_all())
+    rows.sort(key=lambda row: row.idx)
 
     report_path = out_dir / "report.md"
     excel_path = out_dir / "report.xlsx"
@@ -261,7 +358,7 @@ def run_batch(
     if is_xlsx:
         print(f"excel: {final_excel}")
     else:
-        print(f"excel: openpyxl not installed, wrote csv instead: {final_excel}")
+        print(f"excel: xlsxwriter/openpyxl not installed, wrote csv instead: {final_excel}")
 
     return out_dir
 
@@ -284,6 +381,7 @@ if __name__ == "__main__":
 
     limit = None
     sleep_seconds = 0.0
+    workers = 16
 
     run_batch(
         input_path=input_path,
@@ -299,4 +397,5 @@ if __name__ == "__main__":
         append_videos=append_videos,
         limit=limit,
         sleep_seconds=sleep_seconds,
+        workers=workers,
     )
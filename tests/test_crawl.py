@@ -0,0 +1,65 @@
+import pytest
+
+from trafipipe import crawl
+from trafipipe.config import CrawlConfig, FetchConfig
+from trafipipe.crawl import _compile, _extract_links, _is_allowed, crawl_urls
+from trafipipe.fetch import FetchResult
+
+
+def test_extract_links_resolves_and_unescapes():
+    html = (
+        '<a HREF="/a?x=1&amp;y=2">a</a>'
+        "<a class='c' href='rel/b'>b</a>"
+        "<a href=c.html>c</a>"
+        '<abbr href="/skip">d</abbr>'
+        '<a data-href="/skip" href="">e</a>'
+    )
+    links = _extract_links(html, "https://example.com/dir/page")
+    assert links == [
+        "https://example.com/a?x=1&y=2",
+        "https://example.com/dir/rel/b",
+        "https://example.com/dir/c.html",
+    ]
+
+
+def test_compile_keeps_backreferences_per_pattern():
+    allow = _compile([r"/(news|blog)/", r"/(\d+)/\1/", r"(?P<y>\d{4})-(?P=y)"])
+    assert _is_allowed("https://example.com/news/x", allow, ())
+    assert _is_allowed("https://example.com/12/12/", allow, ())
+    assert _is_allowed("https://example.com/2024-2024", allow, ())
+    assert not _is_allowed("https://example.com/12/34/", allow, ())
+    assert not _is_allowed("https://example.com/2024-2025", allow, ())
+
+
+_SITE = {
+    "https://example.com/": ['/a', '/b?page=2#top', 'https://other.com/x', 'mailto:me@x'],
+    "https://example.com/a": ['/', '/a/deep', '/skip/me'],
+    "https://example.com/b": ['/a', '/b/deep'],
+    "https://example.com/a/deep": ['/a/deeper'],
+    "https://example.com/b/deep": [],
+}
+
+
+def _fake_fetch(url, config):
+    if url not in _SITE:
+        raise OSError("unreachable")
+    links = "".join(f'<a href="{href}">x</a>' for href in _SITE[url])
+    return FetchResult(links, 200)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_crawl_frontier_dedupes_and_respects_limits(monkeypatch, workers):
+    monkeypatch.setattr(crawl, "fetch_html", _fake_fetch)
+    config = CrawlConfig(max_depth=2, max_workers=workers, deny_patterns=[r"/skip/"])
+    urls = crawl_urls(["https://example.com/#frag"], FetchConfig(), config)
+    assert urls[0] == "https://example.com/"
+    assert sorted(urls) == [
+        "https://example.com/",
+        "https://example.com/a",
+        "https://example.com/a/deep",
+        "https://example.com/b",
+        "https://example.com/b/deep",
+    ]
+
+    config.max_pages = 2
+    assert len(crawl_urls(["https://example.com/"], FetchConfig(), config)) == 2
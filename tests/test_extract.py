@@ -0,0 +1,90 @@
+from trafipipe import extract
+from trafipipe.config import ExtractConfig
+from trafipipe.extract import _prepare_html, extract_batch, extract_text_and_metadata
+
+
+def test_huanqiu_textarea_keeps_page_metadata():
+    body = "".join(f"<p>第{i}段：这是一段足够长的正文内容，用来测试抽取流程。</p>" for i in range(20))
+    html = (
+        "<html><head><title>文章标题</title>"
+        '<meta property="og:title" content="OG标题">'
+        '<link rel="canonical" href="https://world.huanqiu.com/article/ABC">'
+        "</head><body><p>环球网快讯，相关报道。</p>"
+        f'<textarea class="article-content">{body.replace("<", "&lt;").replace(">", "&gt;")}</textarea>'
+        "</body></html>"
+    )
+    text, meta = extract_text_and_metadata(
+        html, "https://world.huanqiu.com/article/ABC?x=1", ExtractConfig()
+    )
+    assert "第19段" in (text or "")
+    assert meta["title"] == "OG标题"
+    assert meta["source"] == "https://world.huanqiu.com/article/ABC"
+
+
+def test_extractor_options_follow_the_clock(monkeypatch):
+    import datetime as dt
+
+    import trafilatura.settings
+
+    from trafipipe.extract import _build_extractor
+
+    class _Later(dt.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return dt.datetime(2099, 1, 2, tzinfo=tz)
+
+    config = ExtractConfig()
+    first = _build_extractor("https://example.com/a", config, "txt", False)
+    monkeypatch.setattr(trafilatura.settings, "datetime", _Later)
+    later = _build_extractor("https://example.com/b", config, "txt", False)
+    assert later.date_params["max_date"] == "2099-01-02"
+    assert first.date_params is not later.date_params
+    assert first.author_blacklist is not later.author_blacklist
+
+
+def test_extract_batch_reports_item_errors(monkeypatch):
+    def fake(html, url, config):
+        if html == "bad":
+            raise ValueError("broken page")
+        return "ok", {"title": "t"}
+
+    monkeypatch.setattr(extract, "extract_text_and_metadata", fake)
+    results = extract_batch([("good", None), ("bad", None)], ExtractConfig(), max_workers=1)
+    assert results == [("ok", {"title": "t"}), (None, {"error": "broken page"})]
+
+
+def test_prepare_html_narrows_book118_and_inlines_media():
+    html = (
+        "<html><head><title>T</title></head><body><div class='nav'>导航</div>"
+        "<div class='article'><p>正文</p><img data-src='/a.jpg'>"
+        "<video src='/v.mp4'></video></div><footer>页脚</footer></body></html>"
+    )
+    out = _prepare_html(
+        html,
+        "https://max.book118.com/x.html",
+        as_html=False,
+        inline_images=True,
+        inline_videos=True,
+        site="book118",
+    )
+    assert "导航" not in out and "页脚" not in out
+    assert "![](https://max.book118.com/a.jpg)" in out
+    assert "[Video] https://max.book118.com/v.mp4" in out
+
+
+def test_prepare_html_narrows_wechat_only_with_inline_images():
+    html = (
+        "<html><head><title>W</title></head><body><div id='side'>侧栏</div>"
+        "<div id='js_content'><p>微信正文</p>"
+        "<img data-src='https://mmbiz.qpic.cn/p.png'></div></body></html>"
+    )
+    url = "https://mp.weixin.qq.com/s/a"
+    out = _prepare_html(
+        html, url, as_html=False, inline_images=True, inline_videos=False, site="wechat"
+    )
+    assert "侧栏" not in out and "微信正文" in out
+    assert "![](https://mmbiz.qpic.cn/p.png)" in out
+    untouched = _prepare_html(
+        html, url, as_html=False, inline_images=False, inline_videos=False, site="wechat"
+    )
+    assert untouched is html
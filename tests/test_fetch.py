@@ -0,0 +1,44 @@
+import asyncio
+
+from trafipipe.config import FetchConfig
+from trafipipe.fetch import (
+    _ASYNC_HTTPX_CLIENTS,
+    _decode_response,
+    close_async_clients,
+    fetch_html,
+    fetch_html_async,
+)
+
+
+def test_decode_response_boms_meta_and_header():
+    assert _decode_response("\ufeff正文".encode("utf-8"), None) == "正文"
+    assert _decode_response("\ufeff正文".encode("utf-16-le"), None) == "正文"
+    assert _decode_response("\ufeff正文".encode("utf-32-le"), None) == "正文"
+    page = '<meta charset="gb2312"><p>中文内容</p>'
+    assert _decode_response(page.encode("gbk"), None) == page
+    assert _decode_response("中文".encode("gbk"), "gbk") == "中文"
+    assert _decode_response(b"abc", "no-such-codec") == "abc"
+
+
+def test_fetch_html_uses_content_type_charset(serve):
+    body = "<p>中文内容</p>".encode("gbk")
+    base = serve({"/gbk": (200, "text/html; charset=GBK", body)})
+    result = fetch_html(base + "/gbk", FetchConfig())
+    assert result.status_code == 200
+    assert result.html == "<p>中文内容</p>"
+
+
+def test_close_async_clients_closes_the_running_loops_clients(serve):
+    base = serve({"/": (200, "text/html; charset=utf-8", b"<p>ok</p>")})
+
+    async def main():
+        result = await fetch_html_async(base + "/", FetchConfig())
+        loop = asyncio.get_running_loop()
+        clients = list(_ASYNC_HTTPX_CLIENTS[loop].values())
+        await close_async_clients()
+        return result, clients, loop in _ASYNC_HTTPX_CLIENTS
+
+    result, clients, still_cached = asyncio.run(main())
+    assert result.html == "<p>ok</p>"
+    assert clients and all(client.is_closed for client in clients)
+    assert not still_cached
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from trafipipe import Pipeline, PipelineConfig
+from trafipipe.fetch import _ASYNC_HTTPX_CLIENTS
+from trafipipe.pipeline import _strip_x_boilerplate
+
+
+def _article(title):
+    paragraphs = "".join(
+        f"<p>第{i}段：这是一段足够长的正文内容，用来测试抽取流程是否正常。</p>"
+        for i in range(12)
+    )
+    html = f"<html><head><title>{title}</title></head><body><article>{paragraphs}</article></body></html>"
+    return 200, "text/html; charset=utf-8", html.encode("utf-8")
+
+
+@pytest.fixture
+def site(serve):
+    listing = b'<html><body><a href="/a">a</a><a href="/b">b</a></body></html>'
+    return serve(
+        {
+            "/": (200, "text/html; charset=utf-8", listing),
+            "/a": _article("A"),
+            "/b": _article("B"),
+        }
+    )
+
+
+@pytest.fixture
+def config():
+    cfg = PipelineConfig()
+    cfg.render.mode = "never"
+    cfg.crawl.max_depth = 1
+    return cfg
+
+
+def test_extract_url_async_and_aclose(site, config):
+    async def main():
+        async with Pipeline(config) as pipeline:
+            result = await pipeline.extract_url_async(site + "/a", max_workers=2)
+            loop = asyncio.get_running_loop()
+            assert loop in _ASYNC_HTTPX_CLIENTS
+            assert list(pipeline._executors) == [2]
+        return result, pipeline, loop in _ASYNC_HTTPX_CLIENTS
+
+    result, pipeline, still_cached = asyncio.run(main())
+    assert result.error is None
+    assert result.title == "A"
+    assert "第11段" in result.text
+    assert not pipeline._executors
+    assert not still_cached
+
+
+def test_crawl_and_extract_async(site, config):
+    async def main():
+        async with Pipeline(config) as pipeline:
+            return await pipeline.crawl_and_extract_async([site + "/"], max_workers=3)
+
+    results = asyncio.run(main())
+    by_url = {result.url: result for result in results}
+    assert set(by_url) == {site + "/", site + "/a", site + "/b"}
+    assert by_url[site + "/b"].title == "B"
+    assert "第11段" in by_url[site + "/a"].text
+
+
+def test_extract_batch_process_pool_reports_errors(site, config):
+    with Pipeline(config) as pipeline:
+        results = pipeline.extract_batch(
+            [site + "/a", site + "/b", site + "/missing"], max_workers=2
+        )
+    assert [result.url for result in results] == [
+        site + "/a",
+        site + "/b",
+        site + "/missing",
+    ]
+    assert [result.title for result in results[:2]] == ["A", "B"]
+    assert results[2].text is None
+    assert "404" in results[2].error
+
+
+def test_strip_x_boilerplate():
+    text = "Hello world\r\nline two\n1.2K\nViews\n·\nNew to X?\nSign up now to get your own timeline"
+    assert _strip_x_boilerplate(text) == "Hello world\nline two"
+    assert _strip_x_boilerplate("Post body\nmore Likes\n12") == "Post body\nmore Likes"
+    assert _strip_x_boilerplate("New to X?\nSign up") == ""
+    assert _strip_x_boilerplate("") == ""
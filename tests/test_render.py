@@ -0,0 +1,19 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from trafipipe.render import _on_render_thread
+
+
+def test_render_calls_share_one_thread():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        idents = set(executor.map(lambda _: _on_render_thread(threading.get_ident), range(8)))
+    assert len(idents) == 1
+    assert threading.get_ident() not in idents
+
+
+def test_nested_render_call_runs_inline():
+    def outer():
+        return threading.get_ident(), _on_render_thread(threading.get_ident)
+
+    outer_ident, inner_ident = _on_render_thread(outer)
+    assert outer_ident == inner_ident